@@ -5,20 +5,30 @@
 Web Interface Module
 
 This module provides a web interface for the voice assistant using either
-Flask or Gradio, depending on the configuration.
+Quart (the async Flask API) or Gradio, depending on the configuration.
 """
 
 import os
 import logging
-import base64
-import tempfile
-from pathlib import Path
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
-from stt import SpeechToText
+from stt import transcribe_array, warmup_whisper_model
 from tts import TextToSpeech
-from chat import ChatEngine
+from chat import ChatEngine, warm_connection
 from knowledge_base import KnowledgeBase
-from utils import setup_logging, get_config, create_directories
+from utils import setup_logging, get_config, create_directories, split_sentences
+
+# uvloop is a faster drop-in event loop; it is not available on Windows,
+# where the default asyncio loop is used instead
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
 
 # Setup logging
 logger = setup_logging()
@@ -30,51 +40,115 @@ config = get_config()
 create_directories(config)
 
 # Initialize components
-stt_engine = None
 tts_engine = None
 chat_engine = None
 knowledge_base = None
 
+# Whisper holds the GIL for the whole forward pass, so transcription runs in
+# worker processes; each worker loads its own copy of the model on start and
+# the web process itself never loads one
+STT_WORKERS = config.get('stt_workers', max(1, (os.cpu_count() or 2) // 2))
+WHISPER_MODEL = config.get('whisper_model', 'base')
+cpu_pool = None
+
+# Set once initialize_components() has finished (successfully or not);
+# the lock keeps concurrent callers from loading the models twice
+_READY = threading.Event()
+_INIT_LOCK = threading.Lock()
+
 def initialize_components():
     """
     Initialize all the components needed for the assistant.
+    
+    Safe to call more than once or from several threads; only the first
+    call does any work.
     """
-    global stt_engine, tts_engine, chat_engine, knowledge_base
+    global tts_engine, chat_engine, knowledge_base, cpu_pool
     
-    logger.info("Initializing components...")
-    stt_engine = SpeechToText(config)
-    tts_engine = TextToSpeech(config)
-    chat_engine = ChatEngine(config)
-    knowledge_base = KnowledgeBase(config)
-    logger.info("All components initialized")
+    with _INIT_LOCK:
+        if _READY.is_set():
+            return
+        
+        try:
+            logger.info("Initializing components...")
+            tts_engine = TextToSpeech(config)
+            chat_engine = ChatEngine(config)
+            knowledge_base = KnowledgeBase(config)
+            # spawn rather than fork: the parent already has torch and threads loaded
+            cpu_pool = ProcessPoolExecutor(
+                max_workers=STT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=warmup_whisper_model,
+                initargs=(WHISPER_MODEL,)
+            )
+            # Workers start on demand; one task each gets them loading now
+            # rather than on the first voice request
+            for _ in range(STT_WORKERS):
+                cpu_pool.submit(warmup_whisper_model, WHISPER_MODEL)
+            # Pre-establish DNS + TLS to Gemini for the synchronous session
+            warm_connection()
+            logger.info("All components initialized")
+        except Exception as e:
+            logger.error("Error initializing components: %s", e, exc_info=True)
+        finally:
+            _READY.set()
+
+async def wait_until_ready():
+    """
+    Wait for the startup preload to finish without blocking the event loop.
+    """
+    if not _READY.is_set():
+        await asyncio.get_running_loop().run_in_executor(None, _READY.wait)
+
+async def shutdown_components():
+    """
+    Release resources held by the components (e.g. the shared Gemini HTTP client).
+    """
+    if chat_engine:
+        await chat_engine.cleanup()
+    if cpu_pool:
+        cpu_pool.shutdown(wait=False, cancel_futures=True)
 
 # Choose UI framework based on configuration
 ui_type = config.get('ui_type', 'gradio').lower()
 
 if ui_type == 'flask':
-    # Flask implementation
+    # Quart implementation (async drop-in for the Flask API, served over ASGI)
     # These imports would need to be installed
-    # from flask import Flask, request, jsonify, render_template, send_file
+    # import aiofiles
+    # import aiofiles.os
+    # import aiofiles.tempfile
+    # import orjson
+    # from quart import Quart, Response, request, render_template, send_file
+    # from starlette.middleware.gzip import GZipMiddleware
+    # from stt import transcribe_audio
     
-    # app = Flask(__name__)
+    # app = Quart(__name__)
+    # 
+    # # Compress JSON and other text responses; audio is already compressed
+    # # and falls below the benefit threshold, so it is left alone
+    # app.asgi_app = GZipMiddleware(app.asgi_app, minimum_size=config.get('gzip_min_size', 512))
+    # 
+    # def jsonify(obj):
+    #     # orjson encodes straight to bytes, several times faster than the stdlib
+    #     return Response(orjson.dumps(obj), mimetype='application/json')
     # 
     # @app.route('/')
-    # def index():
-    #     return render_template('index.html')
+    # async def index():
+    #     return await render_template('index.html')
     # 
     # @app.route('/api/chat', methods=['POST'])
-    # def chat_endpoint():
-    #     if not chat_engine:
-    #         initialize_components()
+    # async def chat_endpoint():
+    #     await wait_until_ready()
     #     
-    #     data = request.json
+    #     data = await request.get_json()
     #     user_input = data.get('message', '')
     #     
     #     if not user_input:
     #         return jsonify({'error': 'No message provided'}), 400
     #     
     #     # Process through AI
-    #     response = chat_engine.process(user_input)
+    #     response = await chat_engine.process(user_input)
     #     
     #     # Generate audio response
     #     audio_file = None
@@ -85,90 +159,192 @@ if ui_type == 'flask':
     #         'audio_url': f'/api/audio/{os.path.basename(audio_file)}' if audio_file else None
     #     })
     # 
+    # @app.route('/api/chat/batch', methods=['POST'])
+    # async def chat_batch_endpoint():
+    #     await wait_until_ready()
+    #     
+    #     data = await request.get_json()
+    #     messages = data.get('messages', [])
+    #     
+    #     if not messages:
+    #         return jsonify({'error': 'No messages provided'}), 400
+    #     
+    #     responses = await chat_engine.process_batch(messages)
+    #     return jsonify({'messages': responses})
+    # 
     # @app.route('/api/speech-to-text', methods=['POST'])
-    # def stt_endpoint():
-    #     if not stt_engine:
-    #         initialize_components()
+    # async def stt_endpoint():
+    #     await wait_until_ready()
     #     
-    #     if 'audio' not in request.files:
+    #     files = await request.files
+    #     if 'audio' not in files:
     #         return jsonify({'error': 'No audio file provided'}), 400
     #     
-    #     audio_file = request.files['audio']
-    #     with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+    #     # Write the upload without blocking the event loop
+    #     audio_file = files['audio']
+    #     async with aiofiles.tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
     #         temp_filename = temp_file.name
-    #         audio_file.save(temp_filename)
-    #     
-    #     # Process audio file
-    #     # In a real implementation, this would process the audio file
-    #     text = "This is a simulated transcription."
+    #         await temp_file.write(audio_file.read())
     #     
-    #     # Clean up
-    #     os.unlink(temp_filename)
+    #     # Whisper inference is CPU-bound, so run it off the event loop
+    #     try:
+    #         text = await asyncio.get_running_loop().run_in_executor(None, transcribe_audio, temp_filename)
+    #     finally:
+    #         # Clean up
+    #         await aiofiles.os.remove(temp_filename)
     #     
     #     return jsonify({'text': text})
     # 
-    # if __name__ == '__main__':
-    #     app.run(
-    #         host=config.get('host', '127.0.0.1'),
-    #         port=config.get('port', 5000),
-    #         debug=config.get('debug', False)
-    #     )
+    # @app.before_serving
+    # async def warm_clients():
+    #     await warm_connection_async()
+    # 
+    # @app.after_serving
+    # async def close_clients():
+    #     await shutdown_components()
+    # 
+    # Run with an ASGI server, e.g.:
+    #     hypercorn app:app --workers 1 --worker-class uvloop
+    # Browsers only negotiate HTTP/2 over TLS, so pass a certificate to get
+    # audio + text responses multiplexed on one connection:
+    #     hypercorn app:app --bind 0.0.0.0:5000 --certfile cert.pem --keyfile key.pem
     
-    logger.info("Flask UI selected but imports are commented out")
+    logger.info("Quart UI selected but imports are commented out")
     
 else:  # Default to Gradio
     # Gradio implementation
     # These imports would need to be installed
     # import gradio as gr
-    # import numpy as np
     
-    def process_audio(audio):
+    def process_audio_chunk(audio_chunks, chunk):
         """
-        Process audio input through the assistant pipeline.
+        Buffer one streamed microphone chunk in memory.
+        
+        Gradio decodes the Opus/WebM upload stream into numpy frames, so the
+        recording never touches disk.
         
         Args:
-            audio: Audio data from Gradio
+            audio_chunks: Chunks received so far for this recording (Gradio state)
+            chunk: (sample_rate, samples) tuple from Gradio
             
         Returns:
-            tuple: (text response, audio response)
+            list: The updated chunk buffer
+        """
+        audio_chunks = audio_chunks or []
+        if chunk is not None:
+            audio_chunks.append(chunk)
+        return audio_chunks
+    
+    async def process_audio(audio_chunks):
+        """
+        Process audio input through the assistant pipeline.
+        
+        Each sentence of the response is sent to TTS as soon as it has
+        streamed out of the LLM, so audio for the first sentence is ready
+        while the rest of the reply is still being generated.
+        
+        Args:
+            audio_chunks: Buffered (sample_rate, samples) chunks from process_audio_chunk
+            
+        Yields:
+            tuple: (transcription, text response so far, next audio clip or None)
         """
-        global stt_engine, tts_engine, chat_engine
+        await wait_until_ready()
+        
+        if not audio_chunks:
+            yield "", "I didn't catch that. Could you please repeat?", None
+            return
         
-        if not stt_engine or not tts_engine or not chat_engine:
-            initialize_components()
+        # Whisper is CPU-bound, so run it in a worker process off the event loop;
+        # if the pool failed to start, a thread at least keeps the loop free
+        sample_rate = audio_chunks[0][0]
+        samples = np.concatenate([samples for _, samples in audio_chunks])
+        if cpu_pool:
+            transcription = await asyncio.get_running_loop().run_in_executor(
+                cpu_pool, transcribe_array, samples, sample_rate, None, WHISPER_MODEL
+            )
+        else:
+            transcription = await asyncio.to_thread(
+                transcribe_array, samples, sample_rate, None, WHISPER_MODEL
+            )
         
-        # For demonstration purposes
-        # In a real implementation, this would process the audio
-        transcription = "This is a simulated transcription."
-        response = f"This is a simulated response to: {transcription}"
+        if not chat_engine:
+            yield transcription, f"This is a simulated response to: {transcription}", None
+            return
         
-        logger.info(f"Processed audio input: {transcription} -> {response}")
+        response = ""
+        pending = ""
+        synth_tasks = []
+        next_clip = 0
         
-        # Return text response and audio response
-        return transcription, response, None  # None for audio output (would be a file path in real implementation)
+        async for chunk in chat_engine.stream(transcription):
+            response += chunk
+            sentences, pending = split_sentences(pending + chunk)
+            if tts_engine:
+                for sentence in sentences:
+                    synth_tasks.append(asyncio.create_task(tts_engine.synthesize_async(sentence)))
+            
+            # Hand finished clips to the UI in order while the text keeps streaming
+            clip = None
+            if next_clip < len(synth_tasks) and synth_tasks[next_clip].done():
+                clip = synth_tasks[next_clip].result()
+                next_clip += 1
+            yield transcription, response, clip
+        
+        if tts_engine and pending.strip():
+            synth_tasks.append(asyncio.create_task(tts_engine.synthesize_async(pending)))
+        
+        for task in synth_tasks[next_clip:]:
+            yield transcription, response, await task
+        
+        logger.info("Processed audio input: %s -> %s", transcription, response)
     
-    def process_text(text_input):
+    async def process_text(text_input):
         """
         Process text input through the assistant pipeline.
         
+        Streams the response so the UI renders text as it is generated.
+        
         Args:
             text_input: Text from Gradio
             
-        Returns:
-            tuple: (text response, audio response)
+        Yields:
+            tuple: (text response so far, audio response)
         """
-        global chat_engine, tts_engine
+        await wait_until_ready()
         
-        if not chat_engine or not tts_engine:
-            initialize_components()
+        if not chat_engine:
+            yield f"This is a simulated response to: {text_input}", None
+            return
         
         # Process through AI
-        response = chat_engine.process(text_input) if chat_engine else f"This is a simulated response to: {text_input}"
+        response = ""
+        async for chunk in chat_engine.stream(text_input):
+            response += chunk
+            # None for audio output (would be a file path in real implementation)
+            yield response, None
         
-        logger.info(f"Processed text input: {text_input} -> {response}")
+        logger.info("Processed text input: %s -> %s", text_input, response)
+    
+    async def process_text_batch(text_inputs):
+        """
+        Process a batch of text inputs collected by Gradio's batching queue.
+        
+        Args:
+            text_inputs: List of texts from concurrent requests
+            
+        Returns:
+            list: A single-element list holding the responses, as Gradio
+                expects for batched functions with one output component
+        """
+        await wait_until_ready()
         
-        # Return text response and audio response
-        return response, None  # None for audio output (would be a file path in real implementation)
+        if not chat_engine:
+            return [[f"This is a simulated response to: {text}" for text in text_inputs]]
+        
+        responses = await chat_engine.process_batch(text_inputs)
+        logger.info("Processed batch of %d text inputs", len(text_inputs))
+        return [responses]
     
     def launch_gradio():
         """
@@ -180,19 +356,31 @@ else:  # Default to Gradio
         #     with gr.Tab("Voice Interaction"):
         #         with gr.Row():
         #             with gr.Column():
-        #                 audio_input = gr.Audio(source="microphone", type="filepath")
+        #                 # Stream Opus/WebM chunks while the user speaks instead of uploading a WAV
+        #                 audio_input = gr.Audio(sources=["microphone"], streaming=True, format="webm", type="numpy")
+        #                 audio_chunks = gr.State([])
         #                 audio_button = gr.Button("Process Audio")
         #             
         #             with gr.Column():
         #                 transcription_output = gr.Textbox(label="Transcription")
         #                 text_output = gr.Textbox(label="Response")
-        #                 audio_output = gr.Audio(label="Audio Response")
+        #                 # Streaming output plays each sentence clip as it arrives
+        #                 audio_output = gr.Audio(label="Audio Response", streaming=True, autoplay=True)
         #         
-        #         audio_button.click(
-        #             process_audio,
-        #             inputs=[audio_input],
-        #             outputs=[transcription_output, text_output, audio_output]
+        #         audio_input.stream(
+        #             process_audio_chunk,
+        #             inputs=[audio_chunks, audio_input],
+        #             outputs=[audio_chunks]
         #         )
+        #         
+        #         # STT is compute-bound, so cap it at the number of STT worker processes
+        #         for trigger in (audio_input.stop_recording, audio_button.click):
+        #             trigger(
+        #                 process_audio,
+        #                 inputs=[audio_chunks],
+        #                 outputs=[transcription_output, text_output, audio_output],
+        #                 concurrency_limit=config.get('stt_concurrency', STT_WORKERS)
+        #             ).then(lambda: [], outputs=[audio_chunks])
         #     
         #     with gr.Tab("Text Chat"):
         #         with gr.Row():
@@ -210,28 +398,55 @@ else:  # Default to Gradio
         #             outputs=[chat_output, chat_audio_output]
         #         )
         #     
+        #     # Batched API endpoint: Gradio collects concurrent calls into one invocation
+        #     batch_input = gr.Textbox(visible=False)
+        #     batch_output = gr.Textbox(visible=False)
+        #     batch_input.submit(
+        #         process_text_batch,
+        #         inputs=[batch_input],
+        #         outputs=[batch_output],
+        #         batch=True,
+        #         max_batch_size=8,
+        #         api_name="chat_batch"
+        #     )
+        #     
         #     gr.Markdown("## How to use")
         #     gr.Markdown("1. In the **Voice Interaction** tab, click the microphone button to record your voice, then click 'Process Audio'.")
         #     gr.Markdown("2. In the **Text Chat** tab, type your message and click 'Send'.")
         #     gr.Markdown("3. The assistant will respond with text and audio (when available).")
         # 
-        # demo.launch(
+        #     # Warm the async Gemini client on the server's event loop
+        #     demo.load(warm_connection_async)
+        # 
+        # # Async handlers + a queue let concurrent users overlap their Gemini calls
+        # demo.queue(
+        #     default_concurrency_limit=config.get('concurrency_limit', 8),
+        #     max_size=config.get('queue_max_size', 64)
+        # ).launch(
         #     server_name=config.get('host', '127.0.0.1'),
         #     server_port=config.get('port', 7860),
         #     share=config.get('share', False)
         # )
+        # 
+        # # Release the shared async HTTP client once the server stops
+        # asyncio.run(shutdown_components())
         
         logger.info("Gradio UI selected but imports are commented out")
     
     # if __name__ == "__main__":
     #     launch_gradio()
 
+# Preload models in the background so the first request doesn't pay the load cost.
+# Spawned STT workers re-import this module and must not start their own preload.
+if multiprocessing.parent_process() is None:
+    threading.Thread(target=initialize_components, daemon=True).start()
+
 # Main entry point
 if __name__ == "__main__":
-    logger.info(f"Starting {config.get('assistant_name', 'Voice Assistant')} with {ui_type} interface")
+    logger.info("Starting %s with %s interface", config.get('assistant_name', 'Voice Assistant'), ui_type)
     
     if ui_type == 'flask':
-        logger.info("To start the Flask server, uncomment the Flask implementation in this file")
+        logger.info("To start the Quart server, uncomment the Quart implementation in this file")
         # app.run(
         #     host=config.get('host', '127.0.0.1'),
         #     port=config.get('port', 5000),
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batch Chat Module
+
+This module sends non-interactive chat workloads through OpenAI's Batch API.
+Requests are uploaded as a single JSONL file and completed within a 24 hour
+window at half the price of the synchronous endpoint, which suits bulk jobs
+such as transcript enrichment that don't need an immediate answer.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Optional, List, Dict, Any
+
+from chat_enhanced import (
+    get_openai_client, _run_sync,
+    DEFAULT_MODEL, DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# Batch states after which polling stops
+TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_file(messages_list: List[List[Dict[str, str]]],
+                     model: str = DEFAULT_MODEL,
+                     temperature: float = DEFAULT_TEMPERATURE,
+                     max_tokens: int = DEFAULT_MAX_TOKENS) -> bytes:
+    """
+    Build the JSONL input file for a batch, one chat completion request per line.
+    
+    Args:
+        messages_list: One message list per request
+        model: Model name
+        temperature: Temperature parameter
+        max_tokens: Maximum tokens parameter
+        
+    Returns:
+        bytes: JSONL file contents; each request's custom_id is its index
+    """
+    lines = [
+        json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }
+        }, separators=(',', ':'))
+        for i, messages in enumerate(messages_list)
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def submit_batch(messages_list: List[List[Dict[str, str]]], **kwargs) -> str:
+    """
+    Upload the requests and create a batch job.
+    
+    Args:
+        messages_list: One message list per request
+        **kwargs: model, temperature and max_tokens overrides for build_batch_file
+        
+    Returns:
+        str: ID of the created batch
+    """
+    client = get_openai_client()
+    if not client:
+        raise RuntimeError("OpenAI client is not available")
+    
+    batch_file = await client.files.create(
+        file=("batch_input.jsonl", build_batch_file(messages_list, **kwargs)),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=COMPLETION_WINDOW
+    )
+    logger.info("Submitted batch %s with %d requests", batch.id, len(messages_list))
+    return batch.id
+
+
+async def wait_for_batch(batch_id: str, poll_interval: float = 5, max_interval: float = 300):
+    """
+    Poll a batch until it reaches a terminal state.
+    
+    The interval doubles after each poll, since batches usually take minutes
+    to hours and there is no point hitting the API every few seconds.
+    
+    Args:
+        batch_id: ID of the batch
+        poll_interval: Initial seconds between polls
+        max_interval: Upper bound on the seconds between polls
+        
+    Returns:
+        The final batch object
+    """
+    client = get_openai_client()
+    if not client:
+        raise RuntimeError("OpenAI client is not available")
+    
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in TERMINAL_STATES:
+            logger.info("Batch %s finished with status %s", batch_id, batch.status)
+            return batch
+        
+        logger.debug("Batch %s is %s, checking again in %.0f seconds", batch_id, batch.status, poll_interval)
+        await asyncio.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, max_interval)
+
+
+async def fetch_batch_results(batch) -> Dict[str, Optional[str]]:
+    """
+    Download and parse a finished batch's output file.
+    
+    Args:
+        batch: Batch object returned by wait_for_batch
+        
+    Returns:
+        Dict[str, Optional[str]]: Response text keyed by custom_id (None for failed requests)
+    """
+    if not batch.output_file_id:
+        logger.error("Batch %s has no output file (status: %s)", batch.id, batch.status)
+        return {}
+    
+    client = get_openai_client()
+    if not client:
+        raise RuntimeError("OpenAI client is not available")
+    
+    content = await client.files.content(batch.output_file_id)
+    results: Dict[str, Optional[str]] = {}
+    
+    for line in content.text.splitlines():
+        if not line:
+            continue
+        
+        record: Dict[str, Any] = json.loads(line)
+        response = record.get("response") or {}
+        try:
+            if response.get("status_code") != 200:
+                raise ValueError(record.get("error") or response.get("status_code"))
+            results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error("Batch request %s failed: %s", record.get("custom_id"), e)
+            results[record["custom_id"]] = None
+    
+    return results
+
+
+async def run_batch_async(messages_list: List[List[Dict[str, str]]], **kwargs) -> List[Optional[str]]:
+    """
+    Submit a batch, wait for it to finish and return its responses.
+    
+    Args:
+        messages_list: One message list per request
+        **kwargs: model, temperature and max_tokens overrides for build_batch_file
+        
+    Returns:
+        List[Optional[str]]: Response text per request, in input order (None for failed requests)
+    """
+    if not messages_list:
+        return []
+    
+    batch_id = await submit_batch(messages_list, **kwargs)
+    batch = await wait_for_batch(batch_id)
+    results = await fetch_batch_results(batch)
+    return [results.get(str(i)) for i in range(len(messages_list))]
+
+
+def run_batch(messages_list: List[List[Dict[str, str]]], **kwargs) -> List[Optional[str]]:
+    """
+    Synchronous wrapper around run_batch_async.
+    
+    Args:
+        messages_list: One message list per request
+        **kwargs: model, temperature and max_tokens overrides for build_batch_file
+        
+    Returns:
+        List[Optional[str]]: Response text per request, in input order (None for failed requests)
+    """
+    return _run_sync(run_batch_async(messages_list, **kwargs))
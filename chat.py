@@ -8,72 +8,529 @@ Uses Hugging Face transformers with local models instead of OpenAI API.
 """
 
 import os
+import logging
+import asyncio
 import requests
-import json
-from typing import Optional
+import httpx
+import orjson
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, List, Iterator, AsyncIterator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Gemini API configuration
+logger = logging.getLogger(__name__)
+
+# Gemini API configuration (validated once at import so a misconfigured
+# deployment fails at boot rather than on the first user request)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+if not GEMINI_API_KEY:
+    raise RuntimeError("GEMINI_API_KEY environment variable not set.")
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1/models/gemini-1.5-flash:generateContent"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1/models/gemini-1.5-flash:streamGenerateContent"
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/"
 SYSTEM_PROMPT = "You are a helpful insurance support agent."
 
-def get_bot_response(user_input: str) -> Optional[str]:
+# Per-request constants, built once
+HEADERS = {"Content-Type": "application/json"}
+PARAMS = {"key": GEMINI_API_KEY}
+STREAM_PARAMS = {"key": GEMINI_API_KEY, "alt": "sse"}
+
+# (connect, read) seconds; bounds worst-case latency when Gemini stalls
+REQUEST_TIMEOUT = (3, 20)
+
+
+class GeminiTimeoutError(Exception):
     """
-    Generate a response from the Gemini 1.5 Flash model.
+    Raised when Gemini does not answer within REQUEST_TIMEOUT.
+    """
+
+# Persistent session so consecutive calls reuse the established TLS connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.headers["Connection"] = "keep-alive"
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+        respect_retry_after_header=True
+    )
+))
+
+# Shared async client so concurrent handlers multiplex on one HTTP/2 connection
+_async_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]),
+    headers=HEADERS,
+    transport=httpx.AsyncHTTPTransport(http2=True, retries=3)
+)
+
+# LRU cache of successful responses, keyed by (system prompt, normalised input)
+RESPONSE_CACHE_SIZE = 4096
+_response_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(user_input: str) -> Tuple[str, str]:
+    """
+    Normalise a user message into a response-cache key.
     
     Args:
         user_input: The user's message.
         
     Returns:
-        str: The generated response, or None if an error occurred.
+        tuple: (system prompt, stripped lower-cased input)
+    """
+    return SYSTEM_PROMPT, user_input.strip().lower()
+
+
+def _cache_get(key: Tuple[str, str]) -> Optional[str]:
+    """
+    Look up a cached response and mark it as most recently used.
+    """
+    with _cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
+
+
+def _cache_put(key: Tuple[str, str], response: str) -> None:
+    """
+    Store a response, evicting the least recently used entry when full.
+    """
+    with _cache_lock:
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def clear_response_cache() -> None:
+    """
+    Drop all cached Gemini responses.
+    """
+    with _cache_lock:
+        _response_cache.clear()
+
+
+# The system prompt never changes, so encode it once and splice each user
+# message into the pre-serialised body instead of rebuilding the dict per call
+_BODY_PREFIX = orjson.dumps({"systemInstruction": {"parts": [{"text": SYSTEM_PROMPT}]}})[:-1] + \
+    b',"contents":[{"role":"user","parts":[{"text":'
+_BODY_SUFFIX = b'}]}]}'
+
+
+def _build_body(user_input: str) -> bytes:
+    """
+    Build the encoded Gemini generateContent request body for a user message.
+    
+    Args:
+        user_input: The user's message.
+        
+    Returns:
+        bytes: The JSON request body.
+    """
+    return _BODY_PREFIX + orjson.dumps(user_input) + _BODY_SUFFIX
+
+
+def _extract_text(response_data: dict) -> Optional[str]:
+    """
+    Pull the first text part out of a Gemini response.
+    
+    Args:
+        response_data: The decoded JSON response body.
+        
+    Returns:
+        str: The generated text, or None if the response has no text part.
     """
-    if not GEMINI_API_KEY:
-        print("Error: GEMINI_API_KEY environment variable not set.")
+    try:
+        return response_data["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError):
+        logger.error("Malformed Gemini response: %s", response_data)
         return None
 
-    headers = {
-        "Content-Type": "application/json"
-    }
-    params = {
-        "key": GEMINI_API_KEY
-    }
-    payload = {
-        "contents": [
-            {
-                "role": "user",
-                "parts": [
-                    {"text": SYSTEM_PROMPT},
-                    {"text": user_input}
-                ]
-            }
-        ]
-    }
 
+def _parse_sse_line(line: str) -> Optional[str]:
+    """
+    Extract the text delta from one server-sent-events line of a Gemini stream.
+    
+    Args:
+        line: A decoded line from the streamGenerateContent?alt=sse response.
+        
+    Returns:
+        str: The text carried by the frame, or None for blank/non-data lines.
+    """
+    if not line.startswith("data:"):
+        return None
     try:
-        response = requests.post(GEMINI_API_URL, headers=headers, params=params, json=payload)
-        response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+        frame = orjson.loads(line[5:])
+        return frame["candidates"][0]["content"]["parts"][0]["text"]
+    except (orjson.JSONDecodeError, KeyError, IndexError, TypeError):
+        return None
+
+
+def _call_gemini(user_input: str) -> Optional[str]:
+    """
+    Call the Gemini 1.5 Flash model (uncached).
+    
+    Args:
+        user_input: The user's message.
         
-        response_data = response.json()
+    Returns:
+        str: The generated response, or None if an error occurred.
+    """
+    try:
+        response = SESSION.post(GEMINI_API_URL, params=PARAMS, data=_build_body(user_input), timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
         
-        if "candidates" in response_data and response_data["candidates"]:
-            first_candidate = response_data["candidates"][0]
-            if "content" in first_candidate and "parts" in first_candidate["content"]:
-                for part in first_candidate["content"]["parts"]:
-                    if "text" in part:
-                        return part["text"]
-        print("Error: No text found in Gemini API response.")
-        return None
+        return _extract_text(orjson.loads(response.content))
 
+    except requests.exceptions.Timeout as e:
+        logger.warning("Gemini API timed out: %s", e)
+        raise GeminiTimeoutError(str(e)) from e
     except requests.exceptions.RequestException as e:
-        print(f"Error making request to Gemini API: {e}")
+        logger.error("Error making request to Gemini API: %s", e)
         return None
-    except json.JSONDecodeError:
-        print("Error: Could not decode JSON response from Gemini API.")
+    except orjson.JSONDecodeError:
+        logger.error("Could not decode JSON response from Gemini API")
         return None
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        logger.error("Unexpected error calling Gemini API: %s", e, exc_info=True)
         return None
 
+
+async def _call_gemini_async(user_input: str) -> Optional[str]:
+    """
+    Call the Gemini 1.5 Flash model (uncached) without blocking the event loop.
+    
+    Uses the shared httpx.AsyncClient so concurrent web handlers overlap their
+    Gemini round-trips instead of serializing on them.
+    
+    Args:
+        user_input: The user's message.
+        
+    Returns:
+        str: The generated response, or None if an error occurred.
+    """
+    try:
+        response = await _async_client.post(GEMINI_API_URL, params=PARAMS, content=_build_body(user_input))
+        response.raise_for_status()
+        
+        return _extract_text(orjson.loads(response.content))
+
+    except httpx.TimeoutException as e:
+        logger.warning("Gemini API timed out: %s", e)
+        raise GeminiTimeoutError(str(e)) from e
+    except httpx.HTTPError as e:
+        logger.error("Error making request to Gemini API: %s", e)
+        return None
+    except orjson.JSONDecodeError:
+        logger.error("Could not decode JSON response from Gemini API")
+        return None
+    except Exception as e:
+        logger.error("Unexpected error calling Gemini API: %s", e, exc_info=True)
+        return None
+
+
+def get_bot_response(user_input: str) -> Optional[str]:
+    """
+    Generate a response from the Gemini 1.5 Flash model.
+    
+    Repeated questions are answered from an in-process LRU cache.
+    
+    Args:
+        user_input: The user's message.
+        
+    Returns:
+        str: The generated response, or None if an error occurred.
+        
+    Raises:
+        GeminiTimeoutError: If Gemini does not answer within REQUEST_TIMEOUT.
+    """
+    key = _cache_key(user_input)
+    response = _cache_get(key)
+    if response is None:
+        response = _call_gemini(user_input)
+        if response is not None:
+            _cache_put(key, response)
+    return response
+
+
+async def get_bot_response_async(user_input: str) -> Optional[str]:
+    """
+    Generate a response from the Gemini 1.5 Flash model without blocking the event loop.
+    
+    Shares the LRU cache with get_bot_response().
+    
+    Args:
+        user_input: The user's message.
+        
+    Returns:
+        str: The generated response, or None if an error occurred.
+        
+    Raises:
+        GeminiTimeoutError: If Gemini does not answer within REQUEST_TIMEOUT.
+    """
+    key = _cache_key(user_input)
+    response = _cache_get(key)
+    if response is None:
+        response = await _call_gemini_async(user_input)
+        if response is not None:
+            _cache_put(key, response)
+    return response
+
+
+async def get_bot_responses_async(user_inputs: List[str]) -> List[Optional[str]]:
+    """
+    Answer a batch of independent messages concurrently.
+    
+    Gemini treats multiple contents entries as one conversation, so a batch
+    is sent as parallel requests multiplexed on the shared HTTP/2
+    connection. Duplicate messages (after cache-key normalisation) are only
+    sent once.
+    
+    Args:
+        user_inputs: The users' messages.
+        
+    Returns:
+        list: One response (or None on error) per input, in input order.
+    """
+    unique = {}
+    for user_input in user_inputs:
+        unique.setdefault(_cache_key(user_input), user_input)
+    
+    results = await asyncio.gather(
+        *(get_bot_response_async(user_input) for user_input in unique.values()),
+        return_exceptions=True
+    )
+    answers = {
+        key: (None if isinstance(result, BaseException) else result)
+        for key, result in zip(unique, results)
+    }
+    return [answers[_cache_key(user_input)] for user_input in user_inputs]
+
+
+def stream_bot_response(user_input: str) -> Iterator[str]:
+    """
+    Stream a response from the Gemini 1.5 Flash model as text chunks arrive.
+    
+    Uses the streamGenerateContent endpoint over SSE so the caller can show
+    the first words after one round-trip instead of waiting for the full
+    reply. Completed responses are added to the LRU cache; a cache hit is
+    yielded as a single chunk.
+    
+    Args:
+        user_input: The user's message.
+        
+    Yields:
+        str: Successive pieces of the generated response.
+        
+    Raises:
+        GeminiTimeoutError: If Gemini does not answer within REQUEST_TIMEOUT.
+    """
+    key = _cache_key(user_input)
+    cached = _cache_get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+
+    try:
+        with SESSION.post(GEMINI_STREAM_URL, params=STREAM_PARAMS, data=_build_body(user_input), stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            for raw_line in response.iter_lines():
+                text = _parse_sse_line(raw_line.decode("utf-8"))
+                if text:
+                    chunks.append(text)
+                    yield text
+    except requests.exceptions.Timeout as e:
+        logger.warning("Gemini API timed out: %s", e)
+        raise GeminiTimeoutError(str(e)) from e
+    except requests.exceptions.RequestException as e:
+        logger.error("Error streaming from Gemini API: %s", e)
+        return
+
+    if chunks:
+        _cache_put(key, "".join(chunks))
+
+
+async def stream_bot_response_async(user_input: str) -> AsyncIterator[str]:
+    """
+    Async variant of stream_bot_response() using the shared httpx client.
+    
+    Args:
+        user_input: The user's message.
+        
+    Yields:
+        str: Successive pieces of the generated response.
+        
+    Raises:
+        GeminiTimeoutError: If Gemini does not answer within REQUEST_TIMEOUT.
+    """
+    key = _cache_key(user_input)
+    cached = _cache_get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+
+    try:
+        async with _async_client.stream("POST", GEMINI_STREAM_URL, params=STREAM_PARAMS, content=_build_body(user_input)) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                text = _parse_sse_line(line)
+                if text:
+                    chunks.append(text)
+                    yield text
+    except httpx.TimeoutException as e:
+        logger.warning("Gemini API timed out: %s", e)
+        raise GeminiTimeoutError(str(e)) from e
+    except httpx.HTTPError as e:
+        logger.error("Error streaming from Gemini API: %s", e)
+        return
+
+    if chunks:
+        _cache_put(key, "".join(chunks))
+
+
+def warm_connection() -> None:
+    """
+    Open a connection to the Gemini host so the first real call skips DNS + TLS setup.
+    
+    Any response (even an error status) leaves a pooled keep-alive
+    connection behind; failures are ignored.
+    """
+    try:
+        SESSION.get(GEMINI_BASE_URL, timeout=REQUEST_TIMEOUT[0]).close()
+        logger.info("Warmed connection to Gemini API")
+    except requests.exceptions.RequestException as e:
+        logger.warning("Could not warm connection to Gemini API: %s", e)
+
+
+async def warm_connection_async() -> None:
+    """
+    Async variant of warm_connection() for the shared httpx client.
+    
+    Must be awaited on the event loop that will serve requests, since the
+    client's pooled connections belong to that loop.
+    """
+    try:
+        await _async_client.get(GEMINI_BASE_URL, timeout=REQUEST_TIMEOUT[0])
+        logger.info("Warmed async connection to Gemini API")
+    except httpx.HTTPError as e:
+        logger.warning("Could not warm async connection to Gemini API: %s", e)
+
+
+async def close_client() -> None:
+    """
+    Close the shared async HTTP client. Call once at application shutdown.
+    """
+    await _async_client.aclose()
+
+
+TIMEOUT_MESSAGE = "The model is taking longer than usual to respond. Please try again."
+
+
+class ChatEngine:
+    """
+    A class to handle Gemini chat for the web interface.
+    """
+    
+    def __init__(self, config):
+        """
+        Initialize the ChatEngine.
+        
+        Args:
+            config (dict): Configuration parameters.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+        self.assistant_name = config.get('assistant_name', 'Voice Assistant')
+        
+        self.logger.info("Initializing ChatEngine with Gemini 1.5 Flash")
+    
+    async def process(self, user_input):
+        """
+        Process user input and return the response.
+        
+        Args:
+            user_input (str): The user's input text.
+            
+        Returns:
+            str: The AI's response.
+        """
+        if not user_input.strip():
+            return "I didn't catch that. Could you please repeat?"
+        
+        try:
+            response = await get_bot_response_async(user_input)
+        except GeminiTimeoutError:
+            return TIMEOUT_MESSAGE
+        if response is None:
+            return "I'm having trouble processing your request right now. Please try again later."
+        return response
+    
+    async def process_batch(self, user_inputs):
+        """
+        Process a batch of user inputs concurrently.
+        
+        Args:
+            user_inputs (list): The users' input texts.
+            
+        Returns:
+            list: The AI's responses, in input order.
+        """
+        responses = await get_bot_responses_async([text for text in user_inputs if text.strip()])
+        answers = iter(responses)
+        results = []
+        for text in user_inputs:
+            if not text.strip():
+                results.append("I didn't catch that. Could you please repeat?")
+                continue
+            response = next(answers)
+            results.append(response if response is not None else
+                           "I'm having trouble processing your request right now. Please try again later.")
+        return results
+    
+    async def stream(self, user_input):
+        """
+        Process user input and yield the response incrementally.
+        
+        Args:
+            user_input (str): The user's input text.
+            
+        Yields:
+            str: Successive pieces of the AI's response.
+        """
+        if not user_input.strip():
+            yield "I didn't catch that. Could you please repeat?"
+            return
+        
+        received = False
+        try:
+            async for chunk in stream_bot_response_async(user_input):
+                received = True
+                yield chunk
+        except GeminiTimeoutError:
+            yield TIMEOUT_MESSAGE
+            return
+        
+        if not received:
+            yield "I'm having trouble processing your request right now. Please try again later."
+    
+    async def cleanup(self):
+        """
+        Clean up resources used by the ChatEngine.
+        """
+        self.logger.info("Cleaning up ChatEngine resources")
+        await close_client()
+
 if __name__ == "__main__":
     print("Testing Gemini 1.5 Flash integration...")
     while True:
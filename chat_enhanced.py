@@ -9,16 +9,45 @@ with improved rate limiting, conversation history, and better error handling.
 It also includes placeholders for retrieval-augmented generation (RAG).
 """
 
+from __future__ import annotations
+
 import os
+import re
+import atexit
+import hashlib
+import functools
 import logging
+import asyncio
+import threading
 import time
+import weakref
 import json
+from collections import OrderedDict, deque
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 
-# Import OpenAI library
-import openai
+# orjson is several times faster than json for config and history; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional on-disk layer for the response cache, so it survives restarts
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+from tenacity import (
+    AsyncRetrying, RetryCallState, retry_if_exception_type,
+    stop_after_attempt, wait_random_exponential
+)
+
+# The OpenAI SDK pulls in httpx, pydantic and friends, so it (and tiktoken)
+# is imported on first use; see _import_openai and _get_encoding
+openai = None
 
 # Configure logging with more structured format
 log_format = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
@@ -32,77 +61,337 @@ CONVERSATION_HISTORY_PATH = Path("conversation_history")
 # Ensure conversation history directory exists
 CONVERSATION_HISTORY_PATH.mkdir(exist_ok=True)
 
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to compact JSON bytes.
+    """
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """
+    Parse JSON bytes.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(frozen=True, slots=True)
+class ChatConfig:
+    """
+    Chat settings, flattened from the sections of config.json.
+    
+    Frozen so the cached instance can be shared safely between callers.
+    """
+    
+    # openai
+    model: str = "gpt-4o"
+    temperature: float = 0.7
+    max_tokens: int = 500
+    system_prompt: str = """
+You are an insurance support assistant. Your goal is to provide helpful, accurate, and clear information about insurance policies, claims, and procedures.
+
+Respond politely and informatively to user queries. If you don't know the answer, acknowledge this and suggest where the user might find the information.
+
+Keep responses concise but complete.
+"""
+    
+    # rate_limiting
+    max_retries: int = 5
+    initial_backoff: float = 1
+    backoff_multiplier: float = 2
+    max_backoff: float = 60
+    requests_per_minute: int = 500
+    tokens_per_minute: int = 30000
+    max_concurrency: int = 5
+    
+    # conversation
+    max_history: int = 10
+    save_history: bool = True
+    # Older turns are folded into a summary once the history passes this
+    # many tokens (or is about to hit max_history), instead of being dropped
+    summarize_history: bool = True
+    max_history_tokens: int = 2000
+    summary_model: str = "gpt-4o-mini"
+    
+    # Route bulk (non-interactive) requests through the Batch API
+    batch_mode: bool = False
+    
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "ChatConfig":
+        """
+        Build the settings from a config.json-style nested dictionary.
+        
+        Args:
+            config: Configuration dictionary; unknown keys are ignored
+            
+        Returns:
+            ChatConfig: The settings, with defaults for anything missing
+        """
+        values = {"batch_mode": config.get("batch_mode", False)}
+        for section in ("openai", "rate_limiting", "conversation"):
+            values.update(config.get(section) or {})
+        
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in values.items() if key in names})
+
+
+@functools.lru_cache(maxsize=None)
+def _read_config(path: Path, mtime_ns: int) -> ChatConfig:
+    """
+    Read and parse a configuration file, cached per (path, mtime).
+    
+    Args:
+        path: Path to the configuration file
+        mtime_ns: Modification time of the file, so edits invalidate the cache
+        
+    Returns:
+        ChatConfig: Configuration settings
+    """
+    config = ChatConfig.from_dict(_loads(path.read_bytes()))
+    logger.info("Loaded configuration from %s", path)
+    return config
+
+
 # Load configuration from file if available
-def load_config() -> Dict[str, Any]:
+def load_config() -> ChatConfig:
     """
     Load configuration from config.json file.
     
+    Re-parses the file only when it has changed.
+    
     Returns:
-        Dict[str, Any]: Configuration dictionary
+        ChatConfig: Configuration settings
     """
     try:
         if CONFIG_PATH.exists():
-            with open(CONFIG_PATH, 'r') as f:
-                config = json.load(f)
-                logger.info(f"Loaded configuration from {CONFIG_PATH}")
-                return config
+            return _read_config(CONFIG_PATH, CONFIG_PATH.stat().st_mtime_ns)
     except Exception as e:
-        logger.error(f"Error loading configuration: {str(e)}")
+        logger.error("Error loading configuration: %s", e)
     
     # Default configuration
-    return {
-        "openai": {
-            "model": "gpt-4o",
-            "temperature": 0.7,
-            "max_tokens": 500,
-            "system_prompt": "You are an insurance support assistant. Your goal is to provide helpful, accurate, and clear information about insurance policies, claims, and procedures."
-        },
-        "rate_limiting": {
-            "max_retries": 5,
-            "initial_backoff": 1,
-            "backoff_multiplier": 2,
-            "max_backoff": 60
-        },
-        "conversation": {
-            "max_history": 10,
-            "save_history": True
-        }
-    }
+    return ChatConfig()
 
 # Load configuration
 CONFIG = load_config()
 
 # Default system prompt
-DEFAULT_SYSTEM_PROMPT = CONFIG.get("openai", {}).get("system_prompt", """
-You are an insurance support assistant. Your goal is to provide helpful, accurate, and clear information about insurance policies, claims, and procedures.
-
-Respond politely and informatively to user queries. If you don't know the answer, acknowledge this and suggest where the user might find the information.
-
-Keep responses concise but complete.
-""")
+DEFAULT_SYSTEM_PROMPT = CONFIG.system_prompt
 
 # Model configuration
-DEFAULT_MODEL = CONFIG.get("openai", {}).get("model", "gpt-4o")
-DEFAULT_TEMPERATURE = CONFIG.get("openai", {}).get("temperature", 0.7)
-DEFAULT_MAX_TOKENS = CONFIG.get("openai", {}).get("max_tokens", 500)
+DEFAULT_MODEL = CONFIG.model
+DEFAULT_TEMPERATURE = CONFIG.temperature
+DEFAULT_MAX_TOKENS = CONFIG.max_tokens
 
 # Rate limiting configuration
-MAX_RETRIES = CONFIG.get("rate_limiting", {}).get("max_retries", 5)
-INITIAL_BACKOFF = CONFIG.get("rate_limiting", {}).get("initial_backoff", 1)
-BACKOFF_MULTIPLIER = CONFIG.get("rate_limiting", {}).get("backoff_multiplier", 2)
-MAX_BACKOFF = CONFIG.get("rate_limiting", {}).get("max_backoff", 60)
+MAX_RETRIES = CONFIG.max_retries
+INITIAL_BACKOFF = CONFIG.initial_backoff
+BACKOFF_MULTIPLIER = CONFIG.backoff_multiplier
+MAX_BACKOFF = CONFIG.max_backoff
+REQUESTS_PER_MINUTE = CONFIG.requests_per_minute
+TOKENS_PER_MINUTE = CONFIG.tokens_per_minute
+MAX_CONCURRENCY = CONFIG.max_concurrency
 
 # Conversation history configuration
-MAX_HISTORY = CONFIG.get("conversation", {}).get("max_history", 10)
-SAVE_HISTORY = CONFIG.get("conversation", {}).get("save_history", True)
+MAX_HISTORY = CONFIG.max_history
+SAVE_HISTORY = CONFIG.save_history
+SUMMARIZE_HISTORY = CONFIG.summarize_history
+MAX_HISTORY_TOKENS = CONFIG.max_history_tokens
+SUMMARY_MODEL = CONFIG.summary_model
+
+SUMMARY_PROMPT = "Summarize this conversation in under 200 tokens. Keep any facts, names, policy details and open questions the assistant will need later."
+SUMMARY_PREFIX = "Prior conversation summary: "
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    Get the tiktoken encoding for the default model, loading it on first use.
+    
+    Returns:
+        The encoding, or None if tiktoken is not installed
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    
+    try:
+        return tiktoken.encoding_for_model(DEFAULT_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def message_tokens(content: str) -> int:
+    """
+    Count the prompt tokens used by one message.
+    
+    Args:
+        content: Message content
+        
+    Returns:
+        int: Token count (about 4 characters per token without tiktoken)
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(content) // 4 + 4
+    # Each message carries a few tokens of role/framing overhead
+    return len(encoding.encode(content)) + 4
+
+
+def count_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Count the prompt tokens used by a list of messages.
+    
+    Args:
+        messages: List of message dictionaries
+        
+    Returns:
+        int: Token count
+    """
+    return sum(message_tokens(m["content"]) for m in messages)
+
+# Rewrite (compact) a history file once it holds this many times max_history lines
+COMPACT_FACTOR = 4
+
+# Seconds new messages may sit in memory before they are written out
+FLUSH_INTERVAL = 1.0
+
+# Parsed history per file, keyed by (mtime_ns, size), so reopening an
+# unchanged session skips reading and parsing it
+_history_cache: Dict[Path, Tuple[Tuple[int, int], List[Dict[str, str]], int]] = {}
+
+# Route bulk (non-interactive) requests through the Batch API
+BATCH_MODE = CONFIG.batch_mode
+
+
+# Response memoization: FAQ-style prompts repeat a lot, and a hit skips the
+# API round-trip entirely. Only near-deterministic calls are cached.
+RESPONSE_CACHE_SIZE = 1024
+CACHE_MAX_TEMPERATURE = 0.2
+RESPONSE_CACHE_DIR = Path("response_cache")
+
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+# Opened by _get_disk_cache on first use, so importing the module doesn't
+# create the cache directory
+_disk_cache = None
+
+
+def _get_disk_cache():
+    """
+    Return the on-disk response cache, opening it on first use.
+    
+    Returns:
+        diskcache.Cache or None if diskcache isn't installed
+    """
+    global _disk_cache
+    if _disk_cache is None and diskcache is not None:
+        with _cache_lock:
+            if _disk_cache is None:
+                _disk_cache = diskcache.Cache(str(RESPONSE_CACHE_DIR))
+    return _disk_cache
+
+
+def _response_cache_key(messages: List[Dict[str, str]], model: str,
+                        temperature: float, max_tokens: int) -> str:
+    """
+    Canonicalize a request into a response-cache key.
+    
+    Args:
+        messages: List of message dictionaries
+        model: Model name
+        temperature: Temperature parameter
+        max_tokens: Maximum tokens parameter
+        
+    Returns:
+        str: Hex digest of the normalized messages and parameters
+    """
+    canonical = [[m["role"], m["content"].strip().lower()] for m in messages]
+    return hashlib.blake2b(_dumps([canonical, model, temperature, max_tokens]), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """
+    Look up a cached response and mark it as most recently used.
+    """
+    with _cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+            return response
+    
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        response = disk_cache.get(key)
+        if response is not None:
+            _cache_put(key, response, persist=False)
+        return response
+    return None
+
+
+def _cache_put(key: str, response: str, persist: bool = True) -> None:
+    """
+    Store a response, evicting the least recently used entry when full.
+    """
+    with _cache_lock:
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    
+    if persist:
+        disk_cache = _get_disk_cache()
+        if disk_cache is not None:
+            disk_cache.set(key, response)
+
+
+def clear_response_cache() -> None:
+    """
+    Drop all cached OpenAI responses.
+    """
+    with _cache_lock:
+        _response_cache.clear()
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        disk_cache.clear()
+
+
+# Connection pool bounds for the shared HTTP client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Errors worth retrying; anything else (e.g. a 400 for a bad request) fails
+# at once. Filled in by _import_openai.
+TRANSIENT_ERRORS: Tuple[type, ...] = ()
 
 
-def initialize_openai_client() -> Optional[openai.OpenAI]:
+def _import_openai():
+    """
+    Import the OpenAI SDK the first time it is needed.
+    
+    Returns:
+        module: The openai module
+    """
+    global openai, TRANSIENT_ERRORS
+    
+    if openai is None:
+        import openai as openai_module
+        openai = openai_module
+        TRANSIENT_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+    return openai
+
+
+def initialize_openai_client() -> Optional[openai.AsyncOpenAI]:
     """
     Initialize the OpenAI client with API key from environment variables.
     
     Returns:
-        Optional[openai.OpenAI]: OpenAI client instance or None if API key is not available
+        Optional[openai.AsyncOpenAI]: OpenAI client instance or None if API key is not available
     """
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
@@ -110,22 +399,291 @@ def initialize_openai_client() -> Optional[openai.OpenAI]:
         return None
     
     try:
-        client = openai.OpenAI(api_key=api_key)
-        return client
+        import httpx
+        _import_openai()
+        
+        # HTTP/2 multiplexes concurrent requests over a few kept-alive
+        # connections, so each turn skips the TCP + TLS handshake
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+        return openai.AsyncOpenAI(api_key=api_key, http_client=httpx.AsyncClient(http2=True, limits=limits))
     except Exception as e:
-        logger.error(f"Failed to initialize OpenAI client: {str(e)}")
+        logger.error("Failed to initialize OpenAI client: %s", e)
         return None
-    except Exception as e:
-        logger.error(f"Failed to initialize OpenAI client: {str(e)}")
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket that meters calls to the OpenAI API.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`. The rate
+    grows additively while calls succeed and is cut multiplicatively on a 429,
+    so clients settle just under the server's limit instead of overshooting it
+    and retrying in lockstep.
+    """
+    
+    def __init__(self, rate: float, capacity: float, min_rate: Optional[float] = None,
+                 increase: float = 1.05, decrease: float = 0.5):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Initial refill rate in tokens per second (also the maximum rate)
+            capacity: Maximum number of tokens the bucket can hold
+            min_rate: Lowest rate the bucket backs off to
+            increase: Multiplicative growth factor applied on success
+            decrease: Multiplicative factor applied on a rate limit error
+        """
+        self.capacity = capacity
+        self.tokens = capacity
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.increase = increase
+        self.decrease = decrease
+        self.last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        # Shared by the sync wrapper loop and any caller's loop, so guard the
+        # arithmetic with a thread lock; waiting happens outside it
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    async def acquire(self, cost: float = 1.0) -> None:
+        """
+        Take `cost` tokens from the bucket, waiting until they are available.
+        
+        Args:
+            cost: Number of tokens the call consumes
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve the tokens up front (the balance may go negative) so
+            # concurrent callers queue behind each other instead of all waking at once
+            self.tokens -= cost
+            wait = max(-self.tokens / self.rate, self._blocked_until - now, 0.0)
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def increase_rate(self) -> None:
+        """
+        Additively increase the rate after a successful call.
+        """
+        with self._lock:
+            self.rate = min(self.rate * self.increase + self.max_rate / 100, self.max_rate)
+    
+    def decrease_rate(self, retry_after: Optional[float] = None) -> None:
+        """
+        Multiplicatively decrease the rate after a rate limit error.
+        
+        Args:
+            retry_after: Seconds the server asked us to wait, if it said
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+    
+    def calibrate(self, remaining: Optional[float], reset: Optional[float]) -> None:
+        """
+        Align the bucket with the server's view of the remaining quota.
+        
+        Args:
+            remaining: Remaining requests/tokens reported by the server
+            reset: Seconds until the server's quota resets
+        """
+        if remaining is None:
+            return
+        
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + reset)
+
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate limit duration header such as "1s", "6m0s" or "120ms".
+    
+    Args:
+        value: Header value
+        
+    Returns:
+        Optional[float]: Duration in seconds, or None if absent or unparseable
+    """
+    if not value:
         return None
+    
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
 
 
-def call_openai_with_retry(client: openai.OpenAI, messages: List[Dict[str, str]], 
-                          model: str = DEFAULT_MODEL, 
-                          temperature: float = DEFAULT_TEMPERATURE,
-                          max_tokens: int = DEFAULT_MAX_TOKENS) -> Tuple[Optional[str], Optional[str]]:
+def _header_float(headers, name: str) -> Optional[float]:
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _calibrate_limits(headers) -> None:
+    """
+    Update the rate limiters from OpenAI's x-ratelimit-* response headers.
+    
+    Args:
+        headers: Response headers
+    """
+    _REQUEST_BUCKET.calibrate(
+        _header_float(headers, "x-ratelimit-remaining-requests"),
+        _parse_duration(headers.get("x-ratelimit-reset-requests"))
+    )
+    _TOKEN_BUCKET.calibrate(
+        _header_float(headers, "x-ratelimit-remaining-tokens"),
+        _parse_duration(headers.get("x-ratelimit-reset-tokens"))
+    )
+
+
+def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """
+    Roughly estimate the tokens a request will count against the TPM limit.
+    
+    Args:
+        messages: List of message dictionaries
+        max_tokens: Maximum tokens requested for the completion
+        
+    Returns:
+        int: Estimated prompt + completion tokens (about 4 characters per token)
+    """
+    return sum(len(m["content"]) for m in messages) // 4 + max_tokens
+
+
+# Process-wide limiters: one for requests per minute, one for tokens per minute
+_REQUEST_BUCKET = TokenBucket(rate=REQUESTS_PER_MINUTE / 60, capacity=max(1, REQUESTS_PER_MINUTE / 60))
+_TOKEN_BUCKET = TokenBucket(rate=TOKENS_PER_MINUTE / 60, capacity=TOKENS_PER_MINUTE / 6)
+
+
+# One AsyncOpenAI client per event loop: the client holds an httpx connection
+# pool, which is expensive to build but cannot be shared between loops.
+# Nor can it be shared across processes; see _reset_after_fork.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, openai.AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+# Event loop backing the synchronous wrappers, kept running in a daemon
+# thread so their client and its connections survive between calls
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+# Caps requests in flight (the token buckets cap their rate). asyncio
+# primitives are bound to one loop, so as with the clients there is one per loop.
+_api_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _get_api_semaphore() -> asyncio.Semaphore:
+    """
+    Get the running event loop's API concurrency semaphore.
+    
+    Returns:
+        asyncio.Semaphore: Semaphore allowing MAX_CONCURRENCY requests at once
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _api_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _api_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENCY)
+    return semaphore
+
+
+def _reset_after_fork() -> None:
+    """
+    Drop the clients and background loop inherited from a parent process.
+    
+    Pooled sockets would be shared with the parent and the loop's thread
+    does not survive fork(), so each worker builds its own on first use.
+    """
+    global _sync_loop, _sync_loop_lock
+    _clients.clear()
+    _api_semaphores.clear()
+    _sync_loop = None
+    _sync_loop_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_openai_client() -> Optional[openai.AsyncOpenAI]:
+    """
+    Get the shared OpenAI client for the running event loop, creating it on first use.
+    
+    Returns:
+        Optional[openai.AsyncOpenAI]: OpenAI client instance or None if API key is not available
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = initialize_openai_client()
+        if client:
+            _clients[loop] = client
+    return client
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine on the background event loop and wait for its result.
+    
+    Unlike asyncio.run(), this reuses one loop (and so one client) for every
+    call and is safe to use from several threads at once.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    global _sync_loop
+    
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="openai-sync-loop", daemon=True).start()
+    
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
+
+async def close_openai_client() -> None:
+    """
+    Close the running event loop's OpenAI client and its connection pool.
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client:
+        await client.close()
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """
+    Log a transient failure before tenacity sleeps and retries.
+    """
+    logger.warning("%s, retrying in %.2f seconds (attempt %d)",
+                   type(retry_state.outcome.exception()).__name__,
+                   retry_state.next_action.sleep, retry_state.attempt_number)
+
+
+async def _create_completion(client: openai.AsyncOpenAI, messages: List[Dict[str, str]],
+                             model: str, temperature: float, max_tokens: int, token_cost: float):
     """
-    Call OpenAI API with exponential backoff retry for rate limiting.
+    Make one metered chat completion request, feeding the result back to the rate limiters.
     
     Args:
         client: OpenAI client instance
@@ -133,55 +691,137 @@ def call_openai_with_retry(client: openai.OpenAI, messages: List[Dict[str, str]]
         model: Model name
         temperature: Temperature parameter
         max_tokens: Maximum tokens parameter
+        token_cost: Tokens to take from the TPM bucket
         
     Returns:
-        Tuple[Optional[str], Optional[str]]: (response text, error message)
+        The parsed chat completion
     """
-    retries = 0
-    backoff = INITIAL_BACKOFF
+    await _REQUEST_BUCKET.acquire()
+    await _TOKEN_BUCKET.acquire(token_cost)
     
-    while retries <= MAX_RETRIES:
-        try:
-            logger.info(f"Sending request to OpenAI API with {len(messages)} messages (attempt {retries + 1})")
-            response = client.chat.completions.create(
+    try:
+        async with _get_api_semaphore():
+            raw_response = await client.chat.completions.with_raw_response.create(
                 model=model,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens
             )
-            
-            if response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content, None
-            else:
-                logger.warning("Received empty response from OpenAI API")
-                return None, "Empty response received"
-                
-        except openai.RateLimitError as e:
-            retries += 1
-            if retries > MAX_RETRIES:
-                logger.error(f"Rate limit exceeded after {MAX_RETRIES} retries")
-                return None, "Rate limit exceeded"
-            
-            logger.warning(f"Rate limit hit, retrying in {backoff} seconds (attempt {retries})")
-            time.sleep(backoff)
-            backoff = min(backoff * BACKOFF_MULTIPLIER, MAX_BACKOFF)
-            
-        except openai.APIError as e:
-            logger.error(f"OpenAI API error: {str(e)}")
-            return None, f"API error: {str(e)}"
-            
-        except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
-            return None, f"Unexpected error: {str(e)}"
+    except openai.RateLimitError as e:
+        # Slow the limiters for everyone, honouring the server's retry-after
+        retry_after = _parse_duration(e.response.headers.get("retry-after"))
+        _REQUEST_BUCKET.decrease_rate(retry_after)
+        _TOKEN_BUCKET.decrease_rate()
+        _calibrate_limits(e.response.headers)
+        raise
+    
+    _calibrate_limits(raw_response.headers)
+    _REQUEST_BUCKET.increase_rate()
+    _TOKEN_BUCKET.increase_rate()
+    return raw_response.parse()
+
+
+async def call_openai_with_retry_async(client: openai.AsyncOpenAI, messages: List[Dict[str, str]], 
+                                      model: str = DEFAULT_MODEL, 
+                                      temperature: float = DEFAULT_TEMPERATURE,
+                                      max_tokens: int = DEFAULT_MAX_TOKENS) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Call OpenAI API, metered by the adaptive rate limiters, retrying transient
+    failures (rate limits, connection errors, 5xx) with fully jittered
+    exponential backoff.
+    
+    Responses to calls with temperature <= CACHE_MAX_TEMPERATURE are
+    memoized on their normalized messages and parameters.
+    
+    Args:
+        client: OpenAI client instance
+        messages: List of message dictionaries
+        model: Model name
+        temperature: Temperature parameter
+        max_tokens: Maximum tokens parameter
+        
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (response text, error message)
+    """
+    # Higher temperatures are meant to vary, so only cache low-temperature calls
+    cache_key = None
+    if temperature <= CACHE_MAX_TEMPERATURE:
+        cache_key = _response_cache_key(messages, model, temperature, max_tokens)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            logger.info("Serving response from cache")
+            return cached, None
+    
+    token_cost = min(_estimate_tokens(messages, max_tokens), _TOKEN_BUCKET.capacity)
+    _import_openai()
+    
+    try:
+        async for attempt in AsyncRetrying(
+            # Full jitter keeps concurrent callers from retrying in sync
+            wait=wait_random_exponential(multiplier=INITIAL_BACKOFF, max=MAX_BACKOFF, exp_base=BACKOFF_MULTIPLIER),
+            stop=stop_after_attempt(MAX_RETRIES + 1),
+            retry=retry_if_exception_type(TRANSIENT_ERRORS),
+            before_sleep=_log_retry,
+            reraise=True
+        ):
+            with attempt:
+                logger.info("Sending request to OpenAI API with %d messages (attempt %d)",
+                            len(messages), attempt.retry_state.attempt_number)
+                response = await _create_completion(client, messages, model, temperature, max_tokens, token_cost)
+    
+    except openai.RateLimitError:
+        logger.error("Rate limit exceeded after %d retries", MAX_RETRIES)
+        return None, "Rate limit exceeded"
     
-    return None, "Maximum retries exceeded"
+    except openai.APIError as e:
+        logger.error("OpenAI API error: %s", e)
+        return None, f"API error: {str(e)}"
+    
+    if response.choices:
+        content = response.choices[0].message.content
+        if cache_key and content:
+            _cache_put(cache_key, content)
+        return content, None
+    else:
+        logger.warning("Received empty response from OpenAI API")
+        return None, "Empty response received"
+
+
+def call_openai_with_retry(client: openai.AsyncOpenAI, messages: List[Dict[str, str]], 
+                          model: str = DEFAULT_MODEL, 
+                          temperature: float = DEFAULT_TEMPERATURE,
+                          max_tokens: int = DEFAULT_MAX_TOKENS) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Synchronous wrapper around call_openai_with_retry_async.
+    
+    Args:
+        client: OpenAI client instance
+        messages: List of message dictionaries
+        model: Model name
+        temperature: Temperature parameter
+        max_tokens: Maximum tokens parameter
+        
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (response text, error message)
+    """
+    return _run_sync(call_openai_with_retry_async(client, messages, model, temperature, max_tokens))
 
 
 class ConversationManager:
     """
     Manages conversation history for chat sessions.
+    
+    History is persisted as append-only JSONL. New messages are buffered and
+    flushed together in a single write at most FLUSH_INTERVAL seconds later;
+    the file is atomically rewritten (compacted) once it grows well past
+    max_history.
     """
     
+    # A server can hold many sessions at once; skip the per-instance __dict__
+    __slots__ = ("session_id", "max_history", "_system", "_turns", "_system_tokens",
+                 "_turn_tokens", "history_file", "_file_lines", "_pending",
+                 "_flush_scheduled", "_flush_loop", "_loaded", "_lock", "__weakref__")
+    
     def __init__(self, session_id: str = "default", max_history: int = MAX_HISTORY):
         """
         Initialize conversation manager.
@@ -192,11 +832,28 @@ class ConversationManager:
         """
         self.session_id = session_id
         self.max_history = max_history
-        self.history: List[Dict[str, str]] = []
-        self.history_file = CONVERSATION_HISTORY_PATH / f"{session_id}.json"
+        # The system prompt is held apart from the other turns, which live in
+        # a bounded deque so the oldest drops off in O(1)
+        self._system: Optional[Dict[str, str]] = None
+        self._turns: deque = deque(maxlen=max_history)
+        # Token counts, computed once per message and evicted in step with
+        # _turns, so checking the budget never re-encodes the history
+        self._system_tokens = 0
+        self._turn_tokens: deque = deque(maxlen=max_history)
+        self.history_file = CONVERSATION_HISTORY_PATH / f"{session_id}.jsonl"
+        self._file_lines = 0
+        # Messages added since the last write
+        self._pending: List[Dict[str, str]] = []
+        self._flush_scheduled = False
+        # Loop whose timer will run the scheduled flush
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Flushes can run on the background loop's thread while the caller
+        # saves or clears from its own, so file writes are serialized
+        self._lock = threading.RLock()
         
-        # Load existing history if available
-        self._load_history()
+        # Existing history is loaded on first use, so a manager that is
+        # created but never used doesn't touch the disk
+        self._loaded = False
     
     def add_message(self, role: str, content: str) -> None:
         """
@@ -206,27 +863,174 @@ class ConversationManager:
             role: Message role ("system", "user", or "assistant")
             content: Message content
         """
+        self._ensure_loaded()
         message = {"role": role, "content": content}
-        self.history.append(message)
-        
-        # Trim history if it exceeds max_history
-        if len(self.history) > self.max_history:
-            # Always keep the first message (system prompt)
-            system_message = None
-            if self.history and self.history[0]["role"] == "system":
-                system_message = self.history[0]
-                self.history = self.history[1:]
+        self._push(message)
+        
+        # Save history
+        if SAVE_HISTORY:
+            with self._lock:
+                self._pending.append(message)
+                self._schedule_flush()
+    
+    def _schedule_flush(self) -> None:
+        """
+        Arrange for pending messages to be written, batching a burst of turns.
+        
+        Inside an event loop the write is deferred by FLUSH_INTERVAL; outside
+        one there is nothing to run it later, so it happens immediately. If
+        the loop holding the timer has closed, the timer will never fire, so
+        the write happens immediately too.
+        """
+        with self._lock:
+            if self._flush_scheduled:
+                if self._flush_loop.is_closed():
+                    self.flush()
+                return
+            
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
             
-            # Remove oldest messages (excluding system message)
-            excess = len(self.history) - self.max_history + (1 if system_message else 0)
-            if excess > 0:
-                self.history = self.history[excess:]
+            self._flush_scheduled = True
+            self._flush_loop = loop
+            _dirty_managers.add(self)
+            loop.call_later(FLUSH_INTERVAL, self.flush)
+    
+    def flush(self) -> None:
+        """
+        Write any pending messages to the history file.
+        """
+        with self._lock:
+            self._flush_scheduled = False
+            self._flush_loop = None
+            _dirty_managers.discard(self)
+            if not self._pending:
+                return
             
-            # Add system message back at the beginning
-            if system_message:
-                self.history.insert(0, system_message)
+            if self._file_lines + len(self._pending) >= self.max_history * COMPACT_FACTOR:
+                self._save_history()
+            else:
+                pending, self._pending = self._pending, []
+                self._append_to_file(pending)
+    
+    def _push(self, message: Dict[str, str]) -> None:
+        """
+        Add a message in memory, evicting the oldest turn beyond max_history.
+        
+        Args:
+            message: Message dictionary
+        """
+        tokens = message_tokens(message["content"])
+        if self._system is None and not self._turns and message["role"] == "system":
+            # Always keep the first message (system prompt); it counts
+            # towards max_history, so leave one slot less for the turns
+            self._system = message
+            self._system_tokens = tokens
+            self._turns = deque(maxlen=max(self.max_history - 1, 0))
+            self._turn_tokens = deque(maxlen=self._turns.maxlen)
+        else:
+            self._turns.append(message)
+            self._turn_tokens.append(tokens)
+    
+    @property
+    def token_count(self) -> int:
+        """
+        Total prompt tokens of the current history.
+        """
+        self._ensure_loaded()
+        return self._system_tokens + sum(self._turn_tokens)
+    
+    @property
+    def history(self) -> List[Dict[str, str]]:
+        """
+        The conversation history, system prompt first.
+        """
+        self._ensure_loaded()
+        if self._system is not None:
+            return [self._system, *self._turns]
+        return list(self._turns)
+    
+    @history.setter
+    def history(self, messages: List[Dict[str, str]]) -> None:
+        self._loaded = True
+        self._system = None
+        self._system_tokens = 0
+        self._turns = deque(maxlen=self.max_history)
+        self._turn_tokens = deque(maxlen=self.max_history)
+        for message in messages:
+            self._push(message)
+    
+    def needs_compaction(self) -> bool:
+        """
+        Check whether older turns should be summarized before the next exchange.
+        
+        Returns:
+            bool: True if the history is over its token budget or the next
+                user/assistant pair would evict a turn
+        """
+        self._ensure_loaded()
+        if len(self._turns) < 4:
+            return False
+        if len(self._turns) + 2 > self._turns.maxlen:
+            return True
+        return self.token_count > MAX_HISTORY_TOKENS
+    
+    def _compaction_keep(self) -> int:
+        """
+        Number of recent turns compact_async leaves as they are.
+        
+        Together with the summary this brings the history down to a third of
+        its capacity, so several exchanges fit before the next compaction.
+        """
+        return max(self._turns.maxlen // 3 - 1, 1)
+    
+    async def compact_async(self, client: openai.AsyncOpenAI) -> None:
+        """
+        Replace all but the most recent turns with a short summary.
+        
+        A summary left by an earlier compaction is folded into the new one,
+        so the history never holds more than one.
+        
+        Args:
+            client: OpenAI client instance used to write the summary
+        """
+        older = list(self._turns)[:len(self._turns) - self._compaction_keep()]
+        if len(older) < 2:
+            return
+        
+        transcript = "\n".join(
+            f"earlier summary: {m['content'][len(SUMMARY_PREFIX):]}"
+            if m["role"] == "system" and m["content"].startswith(SUMMARY_PREFIX)
+            else f"{m['role']}: {m['content']}"
+            for m in older
+        )
+        summary, error = await call_openai_with_retry_async(
+            client,
+            [{"role": "system", "content": SUMMARY_PROMPT}, {"role": "user", "content": transcript}],
+            model=SUMMARY_MODEL,
+            temperature=0,
+            max_tokens=200
+        )
+        if not summary:
+            logger.warning("Could not summarize conversation history: %s", error)
+            return
+        
+        # Drop the summarized turns that are still at the front; anything added
+        # while the summary was being written stays as it is
+        for message in older:
+            if not self._turns or self._turns[0] is not message:
+                break
+            self._turns.popleft()
+            self._turn_tokens.popleft()
+        
+        content = SUMMARY_PREFIX + summary
+        self._turns.appendleft({"role": "system", "content": content})
+        self._turn_tokens.appendleft(message_tokens(content))
+        logger.info("Summarized %d older messages in session %s", len(older), self.session_id)
         
-        # Save history
         if SAVE_HISTORY:
             self._save_history()
     
@@ -246,42 +1050,159 @@ class ConversationManager:
         Args:
             keep_system_prompt: Whether to keep the system prompt
         """
-        if keep_system_prompt and self.history and self.history[0]["role"] == "system":
-            system_message = self.history[0]
-            self.history = [system_message]
+        self._ensure_loaded()
+        if keep_system_prompt and self._system is not None:
+            self.history = [self._system]
         else:
             self.history = []
         
         if SAVE_HISTORY:
             self._save_history()
     
+    def _ensure_loaded(self) -> None:
+        """
+        Load the history from disk if that hasn't happened yet.
+        """
+        if not self._loaded:
+            self._load_history()
+    
     def _load_history(self) -> None:
         """
         Load conversation history from file.
+        
+        Replays the JSONL log through the same bounding as add_message. An
+        unchanged file (same mtime and size) is served from a parse cache.
+        Lines that don't parse (a write torn by a crash) are dropped and the
+        file is rewritten, so later appends never land on a partial line.
         """
+        self._loaded = True
         try:
-            if self.history_file.exists():
-                with open(self.history_file, 'r') as f:
-                    self.history = json.load(f)
-                logger.info(f"Loaded conversation history from {self.history_file}")
+            # stat() doubles as the existence check
+            try:
+                stat = self.history_file.stat()
+            except FileNotFoundError:
+                self._migrate_legacy_history()
+                return
+            
+            cached = _history_cache.get(self.history_file)
+            if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+                self.history = cached[1]
+                self._file_lines = cached[2]
+                return
+            
+            with open(self.history_file, 'rb') as f:
+                data = f.read()
+            messages = []
+            damaged = bool(data) and not data.endswith(b"\n")
+            for line in data.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    messages.append(_loads(line))
+                except ValueError:
+                    damaged = True
+            self._file_lines = len(messages)
+            self.history = messages
+            
+            if damaged:
+                logger.warning("Dropped unreadable lines from %s", self.history_file)
+                self._save_history()
+            else:
+                self._update_cache()
+            logger.info("Loaded conversation history from %s", self.history_file)
         except Exception as e:
-            logger.error(f"Error loading conversation history: {str(e)}")
+            logger.error("Error loading conversation history: %s", e)
             self.history = []
     
-    def _save_history(self) -> None:
+    def _migrate_legacy_history(self) -> None:
         """
-        Save conversation history to file.
+        Import history saved by older versions as a single JSON array.
         """
+        legacy_file = self.history_file.with_suffix(".json")
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
-            logger.debug(f"Saved conversation history to {self.history_file}")
-        except Exception as e:
-            logger.error(f"Error saving conversation history: {str(e)}")
+            with open(legacy_file, 'rb') as f:
+                self.history = _loads(f.read())
+        except FileNotFoundError:
+            return
+        
+        self._save_history()
+        logger.info("Migrated conversation history from %s", legacy_file)
+    
+    def _append_to_file(self, messages: List[Dict[str, str]]) -> None:
+        """
+        Append messages to the history file in one write.
+        
+        Args:
+            messages: Message dictionaries
+        """
+        with self._lock:
+            try:
+                with open(self.history_file, 'ab') as f:
+                    f.write(b"".join(_dumps(message) + b"\n" for message in messages))
+                self._file_lines += len(messages)
+                self._update_cache()
+            except Exception as e:
+                logger.error("Error saving conversation history: %s", e)
+    
+    def _save_history(self) -> None:
+        """
+        Save conversation history to file, compacting it to the current messages.
+        
+        Writes to a temporary file and swaps it in with os.replace(), so a
+        crash mid-write never leaves a truncated history behind.
+        """
+        with self._lock:
+            self._pending = []
+            tmp_file = self.history_file.with_suffix(".jsonl.tmp")
+            try:
+                with open(tmp_file, 'wb') as f:
+                    f.write(b"".join(_dumps(message) + b"\n" for message in self.history))
+                os.replace(tmp_file, self.history_file)
+                self._file_lines = len(self.history)
+                self._update_cache()
+                logger.debug("Saved conversation history to %s", self.history_file)
+            except Exception as e:
+                logger.error("Error saving conversation history: %s", e)
+    
+    def _update_cache(self) -> None:
+        """
+        Record the file's current state in the parse cache.
+        """
+        stat = self.history_file.stat()
+        _history_cache[self.history_file] = ((stat.st_mtime_ns, stat.st_size), list(self.history), self._file_lines)
 
 
-def get_bot_response(user_input: str, context: Optional[List[str]] = None, 
-                    session_id: str = "default", conversation: Optional[ConversationManager] = None) -> str:
+# Managers with a flush scheduled, written out at exit since the event loop
+# running their timers may never get to them
+_dirty_managers: "weakref.WeakSet[ConversationManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    for manager in list(_dirty_managers):
+        manager.flush()
+
+
+def _error_message(error: Optional[str]) -> str:
+    """
+    Map an error from call_openai_with_retry_async to a user-facing message.
+    
+    Args:
+        error: Error message returned by the API call
+        
+    Returns:
+        str: Message to show the user
+    """
+    if error == "Rate limit exceeded":
+        return "I'm currently handling too many requests. Please try again in a moment."
+    elif error and "API error" in error:
+        return "I encountered an issue while processing your request. Please try again later."
+    
+    return "I'm experiencing technical difficulties. Please try again later."
+
+
+async def get_bot_response_async(user_input: str, context: Optional[List[str]] = None, 
+                                session_id: str = "default", conversation: Optional[ConversationManager] = None) -> str:
     """
     Get a response from the AI assistant based on user input and optional context.
     
@@ -297,8 +1218,8 @@ def get_bot_response(user_input: str, context: Optional[List[str]] = None,
     if not user_input.strip():
         return "I didn't receive any input. How can I help you with your insurance needs?"
     
-    # Initialize OpenAI client
-    client = initialize_openai_client()
+    # Get the shared OpenAI client
+    client = get_openai_client()
     if not client:
         return "I'm having trouble connecting to my knowledge base. Please try again later."
     
@@ -309,8 +1230,12 @@ def get_bot_response(user_input: str, context: Optional[List[str]] = None,
     if not conv.history or conv.history[0]["role"] != "system":
         conv.add_message("system", DEFAULT_SYSTEM_PROMPT)
     
+    # Fold older turns into a summary rather than letting them fall off
+    if SUMMARIZE_HISTORY and conv.needs_compaction():
+        await conv.compact_async(client)
+    
     # Add context from retrieval if available
-    if context and len(context) > 0:
+    if context:
         context_text = "\n\n".join(context)
         context_message = f"""Additional context information:\n{context_text}\n\nPlease use this information to help answer the user's question if relevant."""
         conv.add_message("system", context_message)
@@ -322,7 +1247,7 @@ def get_bot_response(user_input: str, context: Optional[List[str]] = None,
     messages = conv.get_messages()
     
     # Call OpenAI API with retry
-    response_text, error = call_openai_with_retry(client, messages)
+    response_text, error = await call_openai_with_retry_async(client, messages)
     
     if response_text:
         # Add assistant response to history
@@ -330,14 +1255,83 @@ def get_bot_response(user_input: str, context: Optional[List[str]] = None,
         return response_text
     else:
         # Handle error cases
-        error_message = "I'm experiencing technical difficulties. Please try again later."
+        return _error_message(error)
+
+
+def get_bot_response(user_input: str, context: Optional[List[str]] = None, 
+                    session_id: str = "default", conversation: Optional[ConversationManager] = None) -> str:
+    """
+    Synchronous wrapper around get_bot_response_async.
+    
+    Args:
+        user_input (str): The user's query or message
+        context (Optional[List[str]]): Optional context from knowledge retrieval
+        session_id (str): Session identifier for conversation history
+        conversation (Optional[ConversationManager]): Existing conversation manager
+        
+    Returns:
+        str: The assistant's response
+    """
+    return _run_sync(get_bot_response_async(user_input, context, session_id, conversation))
+
+
+def _single_turn_messages(user_input: str, context: Optional[List[str]] = None) -> List[Dict[str, str]]:
+    """
+    Build the messages for a standalone prompt with no conversation history.
+    
+    Args:
+        user_input (str): The user's query
+        context (Optional[List[str]]): Optional context from knowledge retrieval
+        
+    Returns:
+        List[Dict[str, str]]: Messages for the API call
+    """
+    messages = [{"role": "system", "content": DEFAULT_SYSTEM_PROMPT}]
+    if context:
+        context_text = "\n\n".join(context)
+        messages.append({"role": "system", "content": f"""Additional context information:\n{context_text}\n\nPlease use this information to help answer the user's question if relevant."""})
+    messages.append({"role": "user", "content": user_input})
+    return messages
+
+
+async def get_bot_responses_async(user_inputs: List[str]) -> List[str]:
+    """
+    Get responses for several independent prompts concurrently.
+    
+    Each prompt is sent on its own with the system prompt and no conversation
+    history, so the requests overlap their network waits instead of queueing.
+    
+    Args:
+        user_inputs (List[str]): The user queries
         
-        if error == "Rate limit exceeded":
-            error_message = "I'm currently handling too many requests. Please try again in a moment."
-        elif error and "API error" in error:
-            error_message = "I encountered an issue while processing your request. Please try again later."
+    Returns:
+        List[str]: The assistant's responses, in the same order as user_inputs
+    """
+    client = get_openai_client()
+    if not client:
+        return ["I'm having trouble connecting to my knowledge base. Please try again later."] * len(user_inputs)
+    
+    async def respond(user_input: str) -> str:
+        if not user_input.strip():
+            return "I didn't receive any input. How can I help you with your insurance needs?"
+        
+        response_text, error = await call_openai_with_retry_async(client, _single_turn_messages(user_input))
+        return response_text if response_text else _error_message(error)
+    
+    return list(await asyncio.gather(*(respond(user_input) for user_input in user_inputs)))
+
+
+def get_bot_responses(user_inputs: List[str]) -> List[str]:
+    """
+    Synchronous wrapper around get_bot_responses_async.
+    
+    Args:
+        user_inputs (List[str]): The user queries
         
-        return error_message
+    Returns:
+        List[str]: The assistant's responses, in the same order as user_inputs
+    """
+    return _run_sync(get_bot_responses_async(user_inputs))
 
 
 # Placeholder for RAG integration
@@ -356,7 +1350,7 @@ class KnowledgeRetriever:
         """
         self.knowledge_base_path = knowledge_base_path
         self.index = None
-        logger.info(f"Knowledge retriever initialized with path: {knowledge_base_path}")
+        logger.info("Knowledge retriever initialized with path: %s", knowledge_base_path)
         # TODO: Initialize FAISS index here
     
     def query(self, user_input: str, top_k: int = 3) -> List[str]:
@@ -370,13 +1364,13 @@ class KnowledgeRetriever:
         Returns:
             List[str]: List of relevant context passages
         """
-        logger.info(f"Querying knowledge base for: {user_input[:50]}...")
+        logger.info("Querying knowledge base for: %s...", user_input[:50])
         # TODO: Implement FAISS query logic
         return []  # Placeholder return
 
 
-def get_bot_response_with_retrieval(user_input: str, session_id: str = "default",
-                                   conversation: Optional[ConversationManager] = None) -> str:
+async def get_bot_response_with_retrieval_async(user_input: str, session_id: str = "default",
+                                               conversation: Optional[ConversationManager] = None) -> str:
     """
     Get a response from the AI assistant with retrieval-augmented generation.
     
@@ -397,12 +1391,78 @@ def get_bot_response_with_retrieval(user_input: str, session_id: str = "default"
         context = []
         
         # Get response with context
-        return get_bot_response(user_input, context, session_id, conversation)
+        return await get_bot_response_async(user_input, context, session_id, conversation)
     
     except Exception as e:
-        logger.error(f"Error in retrieval-augmented response: {str(e)}")
+        logger.error("Error in retrieval-augmented response: %s", e)
         # Fall back to regular response without retrieval
-        return get_bot_response(user_input, None, session_id, conversation)
+        return await get_bot_response_async(user_input, None, session_id, conversation)
+
+
+def get_bot_response_with_retrieval(user_input: str, session_id: str = "default",
+                                   conversation: Optional[ConversationManager] = None) -> str:
+    """
+    Synchronous wrapper around get_bot_response_with_retrieval_async.
+    
+    Args:
+        user_input (str): The user's query or message
+        session_id (str): Session identifier for conversation history
+        conversation (Optional[ConversationManager]): Existing conversation manager
+        
+    Returns:
+        str: The assistant's response
+    """
+    return _run_sync(get_bot_response_with_retrieval_async(user_input, session_id, conversation))
+
+
+async def get_bot_responses_batch_async(user_inputs: List[str]) -> List[str]:
+    """
+    Get retrieval-augmented responses for a list of independent prompts.
+    
+    With "batch_mode" enabled in config.json the prompts go through the
+    Batch API (cheaper, but results can take up to 24 hours); otherwise they
+    are sent concurrently to the chat completions endpoint.
+    
+    Args:
+        user_inputs (List[str]): The user queries
+        
+    Returns:
+        List[str]: The assistant's responses, in the same order as user_inputs
+    """
+    if not BATCH_MODE:
+        return await get_bot_responses_async(user_inputs)
+    
+    # Imported here because batch_enhanced builds on this module
+    from batch_enhanced import run_batch_async
+    
+    # Initialize retriever (placeholder for now)
+    # retriever = KnowledgeRetriever()
+    # contexts = [retriever.query(user_input) for user_input in user_inputs]
+    contexts = [[] for _ in user_inputs]
+    
+    try:
+        results = await run_batch_async([
+            _single_turn_messages(user_input, context)
+            for user_input, context in zip(user_inputs, contexts)
+        ])
+    except Exception as e:
+        logger.error("Error running batch: %s", e)
+        results = [None] * len(user_inputs)
+    
+    return [result if result else _error_message(None) for result in results]
+
+
+def get_bot_responses_batch(user_inputs: List[str]) -> List[str]:
+    """
+    Synchronous wrapper around get_bot_responses_batch_async.
+    
+    Args:
+        user_inputs (List[str]): The user queries
+        
+    Returns:
+        List[str]: The assistant's responses, in the same order as user_inputs
+    """
+    return _run_sync(get_bot_responses_batch_async(user_inputs))
 
 
 class ChatEngine:
@@ -411,6 +1471,9 @@ class ChatEngine:
     This maintains compatibility with the existing codebase while adding new functionality.
     """
     
+    __slots__ = ("logger", "config", "openai_api_key", "model_name", "temperature", "max_tokens",
+                 "assistant_name", "use_retrieval", "session_id", "conversation")
+    
     def __init__(self, config):
         """
         Initialize the ChatEngine.
@@ -447,9 +1510,9 @@ class ChatEngine:
             system_prompt = system_prompt.replace("{assistant_name}", self.assistant_name)
             self.conversation.add_message("system", system_prompt)
         
-        self.logger.info(f"Initializing ChatEngine with model: {self.model_name}")
+        self.logger.info("Initializing ChatEngine with model: %s", self.model_name)
     
-    def process(self, user_input):
+    async def process_async(self, user_input):
         """
         Process user input and return the response.
         
@@ -467,14 +1530,26 @@ class ChatEngine:
             
             # Use the appropriate response function
             if self.use_retrieval:
-                return get_bot_response_with_retrieval(user_input, self.session_id, self.conversation)
+                return await get_bot_response_with_retrieval_async(user_input, self.session_id, self.conversation)
             else:
-                return get_bot_response(user_input, None, self.session_id, self.conversation)
+                return await get_bot_response_async(user_input, None, self.session_id, self.conversation)
                 
         except Exception as e:
-            self.logger.error(f"Error processing input: {str(e)}")
+            self.logger.error("Error processing input: %s", e)
             return "I'm having trouble processing your request right now. Please try again later."
     
+    def process(self, user_input):
+        """
+        Process user input and return the response.
+        
+        Args:
+            user_input (str): The user's input text.
+            
+        Returns:
+            str: The AI's response.
+        """
+        return _run_sync(self.process_async(user_input))
+    
     def clear_conversation(self, keep_system_prompt: bool = True):
         """
         Clear the conversation history.
@@ -495,7 +1570,11 @@ class ChatEngine:
             try:
                 self.conversation._save_history()
             except Exception as e:
-                self.logger.error(f"Error saving conversation history during cleanup: {str(e)}")
+                self.logger.error("Error saving conversation history during cleanup: %s", e)
+        
+        # Release the pooled connections used by the synchronous wrappers
+        if _sync_loop is not None:
+            _run_sync(close_openai_client())
 
 
 # For direct script execution
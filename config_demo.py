@@ -12,9 +12,15 @@ import os
 import sys
 import json
 import logging
+import functools
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,10 +30,31 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _read_config(config_path, mtime_ns):
+    """
+    Read and parse a configuration file, cached per (path, mtime).
+    
+    Args:
+        config_path: Path to the configuration file
+        mtime_ns: Modification time of the file, so edits invalidate the cache
+        
+    Returns:
+        dict: Configuration dictionary
+    """
+    data = Path(config_path).read_bytes()
+    config = orjson.loads(data) if orjson else json.loads(data)
+    logger.info("Loaded configuration from %s", config_path)
+    return config
+
+
 def load_config(config_path="config_example.json"):
     """
     Load configuration from a JSON file.
     
+    The file is only re-read when its modification time changes; the
+    returned dictionary is shared between callers and should not be modified.
+    
     Args:
         config_path: Path to the configuration file
         
@@ -35,25 +62,56 @@ def load_config(config_path="config_example.json"):
         dict: Configuration dictionary
     """
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-            logger.info(f"Loaded configuration from {config_path}")
-            return config
+        return _read_config(config_path, os.stat(config_path).st_mtime_ns)
     except FileNotFoundError:
-        logger.error(f"Configuration file {config_path} not found")
+        logger.error("Configuration file %s not found", config_path)
         return None
     except json.JSONDecodeError as e:
-        logger.error(f"Error parsing configuration file: {str(e)}")
+        logger.error("Error parsing configuration file: %s", e)
         return None
     except Exception as e:
-        logger.error(f"Unexpected error loading configuration: {str(e)}")
+        logger.error("Unexpected error loading configuration: %s", e)
         return None
 
 
+# (section heading, config key, [(label, key, unit suffix), ...])
+CONFIG_DISPLAY = [
+    ("OpenAI Settings", "openai", [
+        ("Model", "model", ""),
+        ("Temperature", "temperature", ""),
+        ("Max Tokens", "max_tokens", ""),
+    ]),
+    ("Rate Limiting Settings", "rate_limiting", [
+        ("Max Retries", "max_retries", ""),
+        ("Initial Backoff", "initial_backoff", " seconds"),
+        ("Backoff Multiplier", "backoff_multiplier", ""),
+        ("Max Backoff", "max_backoff", " seconds"),
+    ]),
+    ("Conversation Settings", "conversation", [
+        ("Max History", "max_history", " messages"),
+        ("Save History", "save_history", ""),
+        ("History Directory", "history_dir", ""),
+    ]),
+    ("Retrieval Settings", "retrieval", [
+        ("Enabled", "enabled", ""),
+        ("Knowledge Base Path", "knowledge_base_path", ""),
+        ("Top K", "top_k", ""),
+        ("Similarity Threshold", "similarity_threshold", ""),
+    ]),
+    ("Logging Settings", "logging", [
+        ("Level", "level", ""),
+        ("File", "file", ""),
+        ("Console", "console", ""),
+    ]),
+]
+
+
 def display_config(config):
     """
     Display the configuration settings.
     
+    The output is built up in memory and written to stdout in one call.
+    
     Args:
         config: Configuration dictionary
     """
@@ -61,53 +119,25 @@ def display_config(config):
         print("No configuration loaded.")
         return
     
-    print("\n===== Configuration Settings =====\n")
-    
-    # OpenAI settings
-    print("OpenAI Settings:")
-    openai_config = config.get("openai", {})
-    print(f"  Model: {openai_config.get('model', 'Not specified')}")
-    print(f"  Temperature: {openai_config.get('temperature', 'Not specified')}")
-    print(f"  Max Tokens: {openai_config.get('max_tokens', 'Not specified')}")
+    lines = ["\n===== Configuration Settings =====\n"]
     
-    # Format system prompt with current time
-    system_prompt = openai_config.get("system_prompt", "Not specified")
-    if "{current_time}" in system_prompt:
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        system_prompt = system_prompt.replace("{current_time}", current_time)
-    print(f"  System Prompt: {system_prompt[:50]}..." if len(system_prompt) > 50 else f"  System Prompt: {system_prompt}")
-    
-    # Rate limiting settings
-    print("\nRate Limiting Settings:")
-    rate_config = config.get("rate_limiting", {})
-    print(f"  Max Retries: {rate_config.get('max_retries', 'Not specified')}")
-    print(f"  Initial Backoff: {rate_config.get('initial_backoff', 'Not specified')} seconds")
-    print(f"  Backoff Multiplier: {rate_config.get('backoff_multiplier', 'Not specified')}")
-    print(f"  Max Backoff: {rate_config.get('max_backoff', 'Not specified')} seconds")
-    
-    # Conversation settings
-    print("\nConversation Settings:")
-    conv_config = config.get("conversation", {})
-    print(f"  Max History: {conv_config.get('max_history', 'Not specified')} messages")
-    print(f"  Save History: {conv_config.get('save_history', 'Not specified')}")
-    print(f"  History Directory: {conv_config.get('history_dir', 'Not specified')}")
-    
-    # Retrieval settings
-    print("\nRetrieval Settings:")
-    retrieval_config = config.get("retrieval", {})
-    print(f"  Enabled: {retrieval_config.get('enabled', 'Not specified')}")
-    print(f"  Knowledge Base Path: {retrieval_config.get('knowledge_base_path', 'Not specified')}")
-    print(f"  Top K: {retrieval_config.get('top_k', 'Not specified')}")
-    print(f"  Similarity Threshold: {retrieval_config.get('similarity_threshold', 'Not specified')}")
-    
-    # Logging settings
-    print("\nLogging Settings:")
-    logging_config = config.get("logging", {})
-    print(f"  Level: {logging_config.get('level', 'Not specified')}")
-    print(f"  File: {logging_config.get('file', 'Not specified')}")
-    print(f"  Console: {logging_config.get('console', 'Not specified')}")
+    for heading, section, fields in CONFIG_DISPLAY:
+        section_config = config.get(section) or {}
+        lines.append(f"{heading}:" if len(lines) == 1 else f"\n{heading}:")
+        for label, key, suffix in fields:
+            value = section_config.get(key)
+            lines.append(f"  {label}: {value}{suffix}" if value is not None else f"  {label}: Not specified{suffix}")
+        
+        if section == "openai":
+            # Format system prompt with current time
+            system_prompt = section_config.get("system_prompt", "Not specified")
+            if "{current_time}" in system_prompt:
+                current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                system_prompt = system_prompt.replace("{current_time}", current_time)
+            lines.append(f"  System Prompt: {system_prompt[:50]}..." if len(system_prompt) > 50 else f"  System Prompt: {system_prompt}")
     
-    print("\n" + "=" * 35 + "\n")
+    lines.append("\n" + "=" * 35 + "\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -9,17 +9,136 @@ for efficient retrieval during conversations.
 """
 
 import os
+import random
+import sqlite3
+import hashlib
 import logging
+import threading
 import json
+from array import array
 from pathlib import Path
 
-# These imports would need to be installed
+import requests
+
+# These imports would need to be installed (math and platform are only
+# used alongside them)
+# import math
+# import platform
 # import numpy as np
-# from langchain.vectorstores import FAISS
-# from langchain.embeddings.openai import OpenAIEmbeddings
+# import faiss
 # from langchain.text_splitter import RecursiveCharacterTextSplitter
 # from langchain.document_loaders import TextLoader, DirectoryLoader, JSONLoader
 
+# Files written inside index_path
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.json"
+
+# OpenAI embeddings endpoint; one request carries at most EMBED_BATCH_SIZE
+# inputs and EMBED_BATCH_TOKENS tokens in total
+EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBED_BATCH_SIZE = 2048
+EMBED_BATCH_TOKENS = 300000
+
+# Embedding cache, stored inside knowledge_dir
+EMBED_CACHE_FILE = "embed_cache.db"
+
+# MinHash settings for reusing the embedding of a lightly edited chunk:
+# NUM_BANDS * BAND_ROWS permutations over SHINGLE_SIZE character shingles,
+# and the estimated Jaccard similarity a cached chunk must exceed
+SHINGLE_SIZE = 5
+NUM_BANDS = 16
+BAND_ROWS = 4
+FUZZY_THRESHOLD = 0.95
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_BANDS * BAND_ROWS)
+]
+
+# faiss.index_factory description; {nlist} is filled in from the corpus size.
+# SQfp16 stores each dimension as a half float, halving memory and scan
+# bandwidth with negligible recall loss. "IVF{nlist},PQ16x8" compresses
+# further to 16 bytes per vector at a larger recall cost; its per-query
+# distance tables are built inside FAISS by the SIMD fvec_L2sqr_ny kernels,
+# which already lay the codebook out for vertical (SoA) loads.
+INDEX_FACTORY = "IVF{nlist},SQfp16"
+
+# IVF training wants roughly 39 vectors per cell; smaller corpora fall
+# back to an exact flat index
+MIN_TRAIN_VECTORS = 256
+
+logger = logging.getLogger(__name__)
+
+# Global index instance shared by every KnowledgeBase in the process (load once)
+_faiss_index = None
+
+
+def get_faiss_index(index_file):
+    """
+    Get or load the FAISS index (singleton pattern).
+    
+    The index is memory-mapped read-only, so the OS only pages in the
+    inverted lists a query touches and worker processes share the page cache
+    instead of each holding a private copy.
+    
+    Args:
+        index_file (str): Path of the index written by faiss.write_index.
+        
+    Returns:
+        faiss.Index: Loaded index
+    """
+    global _faiss_index
+    
+    if _faiss_index is None:
+        logger.info(f"Memory-mapping FAISS index: {index_file}")
+        # In a real implementation, this would be uncommented
+        # _faiss_index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    
+    return _faiss_index
+
+
+def _minhash(text):
+    """
+    Compute the MinHash signature of a text's character shingles.
+    
+    Args:
+        text (str): Text to sign.
+        
+    Returns:
+        array: One unsigned 64-bit value per permutation.
+    """
+    text = " ".join(text.lower().split())
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1))}
+    hashes = [
+        int.from_bytes(hashlib.blake2b(sh.encode('utf-8'), digest_size=8).digest(), 'little')
+        for sh in shingles
+    ]
+    return array('Q', (
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def _band_keys(signature):
+    """
+    Split a MinHash signature into locality-sensitive hashing band keys.
+    
+    Args:
+        signature (array): MinHash signature from _minhash.
+        
+    Returns:
+        list: (band, key) pairs; similar texts are likely to share at least one.
+    """
+    return [
+        (band, hashlib.blake2b(signature[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes(),
+                               digest_size=8).digest())
+        for band in range(NUM_BANDS)
+    ]
+
+
 class KnowledgeBase:
     """
     A class to handle the knowledge base using FAISS vector database.
@@ -41,6 +160,9 @@ class KnowledgeBase:
         self.index_path = config.get('index_path', 'faiss_index')
         self.chunk_size = config.get('chunk_size', 1000)
         self.chunk_overlap = config.get('chunk_overlap', 200)
+        self.nprobe = config.get('nprobe', 8)
+        self.index_factory = config.get('index_factory', INDEX_FACTORY)
+        self.embedding_model = config.get('embedding_model', EMBEDDING_MODEL)
         
         # Create knowledge directory if it doesn't exist
         Path(self.knowledge_dir).mkdir(parents=True, exist_ok=True)
@@ -48,6 +170,22 @@ class KnowledgeBase:
         self.logger.info(f"Initializing KnowledgeBase from: {self.knowledge_dir}")
         self.vectorstore = None
         
+        # One session for all embedding requests so batches share a kept-alive connection
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.openai_api_key}",
+            "Content-Type": "application/json"
+        })
+        
+        # FAISS only stores vectors, so chunk texts are kept here keyed by faiss id
+        self.docstore = {}
+        
+        # Content-addressed cache so reindexing only embeds new or changed chunks.
+        # The instance is built in a preload thread and queried from request
+        # threads, so the connection is shared across threads under a lock
+        self.embed_cache = self._open_embed_cache()
+        self.embed_cache_lock = threading.Lock()
+        
         # Load or create the vector database
         self._load_or_create_vectorstore()
     
@@ -59,13 +197,17 @@ class KnowledgeBase:
             # Check if index already exists
             if os.path.exists(self.index_path) and os.path.isdir(self.index_path):
                 self.logger.info(f"Loading existing FAISS index from {self.index_path}")
+                self.vectorstore = get_faiss_index(os.path.join(self.index_path, INDEX_FILE))
                 # In a real implementation, this would be uncommented
-                # self.vectorstore = FAISS.load_local(
-                #     self.index_path,
-                #     OpenAIEmbeddings(openai_api_key=self.openai_api_key)
-                # )
+                # with open(os.path.join(self.index_path, DOCSTORE_FILE), 'r') as f:
+                #     self.docstore = {int(i): text for i, text in json.load(f).items()}
             else:
                 self.logger.info("Creating new FAISS index from knowledge files")
+                # In a real implementation, this would be uncommented
+                # # x86 wheels ship an AVX2 build; without it the fp16 distance
+                # # kernels fall back to scalar code (NEON is used on ARM64)
+                # if platform.machine().lower() in ('x86_64', 'amd64') and not hasattr(faiss, 'swigfaiss_avx2'):
+                #     self.logger.warning("FAISS was built without AVX2, vector search will be slower")
                 self._create_new_index()
         except Exception as e:
             self.logger.error(f"Error loading/creating vector database: {str(e)}")
@@ -91,17 +233,224 @@ class KnowledgeBase:
             # )
             # texts = text_splitter.split_documents(documents)
             # 
-            # # Create embeddings and vectorstore
-            # embeddings = OpenAIEmbeddings(openai_api_key=self.openai_api_key)
-            # self.vectorstore = FAISS.from_documents(texts, embeddings)
+            # # Create embeddings as an (N, d) float32 matrix
+            # xb = self._embed_texts([t.page_content for t in texts])
+            # n, d = xb.shape
+            # 
+            # if n >= MIN_TRAIN_VECTORS:
+            #     # IVF limits each query to nprobe of the nlist Voronoi cells and
+            #     # the scalar quantizer stores the vectors as fp16
+            #     nlist = min(int(4 * math.sqrt(n)), n // 39)
+            #     index = faiss.index_factory(d, self.index_factory.format(nlist=nlist))
+            #     index.train(xb)
+            # else:
+            #     index = faiss.IndexFlatL2(d)
+            # index.add(xb)
+            # 
+            # self.vectorstore = index
+            # self.docstore = {i: t.page_content for i, t in enumerate(texts)}
             # 
             # # Save the index
-            # self.vectorstore.save_local(self.index_path)
+            # self._save_index()
             
             self.logger.info(f"Created and saved new FAISS index to {self.index_path}")
         except Exception as e:
             self.logger.error(f"Error creating new index: {str(e)}")
     
+    def _embed_batches(self, texts):
+        """
+        Split texts into request-sized batches for the embeddings endpoint.
+        
+        Args:
+            texts (list): Chunk texts to embed.
+            
+        Yields:
+            tuple: (start, batch) where start is the index of the batch's first text.
+        """
+        start, batch, batch_tokens = 0, [], 0
+        for text in texts:
+            # Rough token estimate, about 4 characters per token
+            tokens = len(text) // 4 + 1
+            if batch and (len(batch) >= EMBED_BATCH_SIZE or batch_tokens + tokens > EMBED_BATCH_TOKENS):
+                yield start, batch
+                start += len(batch)
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            yield start, batch
+    
+    def _open_embed_cache(self):
+        """
+        Open the SQLite embedding cache, creating its tables if needed.
+        
+        Returns:
+            sqlite3.Connection: Connection to the cache database.
+        """
+        conn = sqlite3.connect(os.path.join(self.knowledge_dir, EMBED_CACHE_FILE),
+                               check_same_thread=False)
+        # The unique constraint's index also serves (band, key) lookups
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache (hash BLOB PRIMARY KEY, vec BLOB, sig BLOB);
+            CREATE TABLE IF NOT EXISTS lsh (band INTEGER, key BLOB, hash BLOB,
+                                            UNIQUE (band, key, hash));
+        """)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'lsh_band_key'").fetchone():
+            # Caches from before band rows were unique hold a copy per reindex
+            conn.executescript("""
+                DELETE FROM lsh WHERE rowid NOT IN
+                    (SELECT MIN(rowid) FROM lsh GROUP BY band, key, hash);
+                DROP INDEX lsh_band_key;
+                CREATE UNIQUE INDEX lsh_band_key_hash ON lsh (band, key, hash);
+            """)
+        return conn
+    
+    def _cache_key(self, text):
+        """
+        Content address of a text's embedding under the current model.
+        
+        Args:
+            text (str): Text to embed.
+            
+        Returns:
+            bytes: SHA-256 digest of model name and text.
+        """
+        return hashlib.sha256((self.embedding_model + text).encode('utf-8')).digest()
+    
+    def _cache_get(self, key):
+        """
+        Look up a cached embedding by its exact key.
+        
+        Args:
+            key (bytes): Cache key from _cache_key.
+            
+        Returns:
+            bytes: FP16 vector bytes, or None on a miss.
+        """
+        row = self.embed_cache.execute("SELECT vec FROM cache WHERE hash = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _cache_get_similar(self, signature):
+        """
+        Look up the cached embedding of a near-identical text by MinHash similarity.
+        
+        Args:
+            signature (array): MinHash signature of the text.
+            
+        Returns:
+            bytes: FP16 vector bytes, or None on a miss.
+        """
+        # Candidates share at least one LSH band with the text
+        candidates = set()
+        for band, band_key in _band_keys(signature):
+            candidates.update(
+                h for (h,) in self.embed_cache.execute(
+                    "SELECT hash FROM lsh WHERE band = ? AND key = ?", (band, band_key)
+                )
+            )
+        
+        best_vec, best_score = None, FUZZY_THRESHOLD
+        for candidate in candidates:
+            vec, sig = self.embed_cache.execute(
+                "SELECT vec, sig FROM cache WHERE hash = ?", (candidate,)
+            ).fetchone()
+            other = array('Q')
+            other.frombytes(sig)
+            score = sum(x == y for x, y in zip(signature, other)) / len(signature)
+            if score > best_score:
+                best_vec, best_score = vec, score
+        
+        return best_vec
+    
+    def _cache_put(self, key, signature, vec):
+        """
+        Store an embedding and its LSH band keys in the cache.
+        
+        Args:
+            key (bytes): Cache key from _cache_key.
+            signature (array): MinHash signature of the text.
+            vec (bytes): FP16 vector bytes.
+        """
+        self.embed_cache.execute(
+            "INSERT OR REPLACE INTO cache (hash, vec, sig) VALUES (?, ?, ?)",
+            (key, vec, signature.tobytes())
+        )
+        self.embed_cache.executemany(
+            "INSERT OR IGNORE INTO lsh (band, key, hash) VALUES (?, ?, ?)",
+            [(band, band_key, key) for band, band_key in _band_keys(signature)]
+        )
+    
+    def _embed_texts(self, texts):
+        """
+        Embed texts with as few API calls as the endpoint limits allow.
+        
+        Texts found in the embedding cache are not sent to the API.
+        
+        Args:
+            texts (list): Texts to embed.
+            
+        Returns:
+            numpy.ndarray: (N, d) float32 matrix, one row per text in input order.
+        """
+        keys = [self._cache_key(text) for text in texts]
+        # MinHash is costly in pure Python, so only exact misses are signed
+        signatures = {}
+        cached = {}
+        with self.embed_cache_lock:
+            for i, key in enumerate(keys):
+                vec = self._cache_get(key)
+                if vec is None:
+                    signatures[i] = _minhash(texts[i])
+                    vec = self._cache_get_similar(signatures[i])
+                if vec is not None:
+                    cached[i] = vec
+        
+        missing = [i for i in range(len(texts)) if i not in cached]
+        self.logger.info(f"Embedding {len(missing)} of {len(texts)} texts ({len(cached)} cached)")
+        
+        vectors = None
+        # In a real implementation, this would be uncommented
+        # if cached:
+        #     d = len(next(iter(cached.values()))) // 2
+        #     vectors = np.empty((len(texts), d), dtype=np.float32)
+        #     for i, vec in cached.items():
+        #         vectors[i] = np.frombuffer(vec, dtype=np.float16)
+        
+        for start, batch in self._embed_batches([texts[i] for i in missing]):
+            response = self.session.post(
+                EMBEDDINGS_URL,
+                json={"model": self.embedding_model, "input": batch},
+                timeout=60
+            )
+            response.raise_for_status()
+            data = response.json()["data"]
+            
+            with self.embed_cache_lock:
+                # In a real implementation, this would be uncommented
+                # if vectors is None:
+                #     vectors = np.empty((len(texts), len(data[0]["embedding"])), dtype=np.float32)
+                # for item in data:
+                #     i = missing[start + item["index"]]
+                #     vectors[i] = item["embedding"]
+                #     # FP16 halves the cache size; the index stores fp16 anyway
+                #     self._cache_put(keys[i], signatures[i], vectors[i].astype(np.float16).tobytes())
+                
+                self.embed_cache.commit()
+        
+        return vectors
+    
+    def _save_index(self):
+        """
+        Write the FAISS index and its docstore to index_path.
+        """
+        Path(self.index_path).mkdir(parents=True, exist_ok=True)
+        
+        # In a real implementation, this would be uncommented
+        # faiss.write_index(self.vectorstore, os.path.join(self.index_path, INDEX_FILE))
+        
+        with open(os.path.join(self.index_path, DOCSTORE_FILE), 'w') as f:
+            json.dump(self.docstore, f)
+    
     def add_documents(self, documents):
         """
         Add new documents to the knowledge base.
@@ -139,10 +488,21 @@ class KnowledgeBase:
             #         processed_docs.append(Document(page_content=doc))
             # 
             # texts = text_splitter.split_documents(processed_docs)
-            # self.vectorstore.add_documents(texts)
+            # xb = self._embed_texts([t.page_content for t in texts])
+            # 
+            # # The shared index is mapped read-only, so load a private writable copy
+            # global _faiss_index
+            # self.vectorstore = faiss.read_index(os.path.join(self.index_path, INDEX_FILE))
+            # _faiss_index = self.vectorstore
+            # 
+            # # New vectors get sequential ids starting after the existing ones
+            # start = self.vectorstore.ntotal
+            # self.vectorstore.add(xb)
+            # for i, t in enumerate(texts, start):
+            #     self.docstore[i] = t.page_content
             # 
             # # Save the updated index
-            # self.vectorstore.save_local(self.index_path)
+            # self._save_index()
             
             self.logger.info("Documents added and index updated")
         except Exception as e:
@@ -167,8 +527,12 @@ class KnowledgeBase:
             self.logger.info(f"Searching knowledge base for: {query}")
             
             # In a real implementation, this would be uncommented
-            # docs = self.vectorstore.similarity_search(query, k=k)
-            # return docs
+            # if hasattr(self.vectorstore, 'nprobe'):
+            #     self.vectorstore.nprobe = self.nprobe
+            # 
+            # xq = self._embed_texts([query])
+            # _, ids = self.vectorstore.search(xq, k)
+            # return [self.docstore[i] for i in ids[0] if i != -1]
             
             # For demonstration purposes
             return [f"Simulated knowledge base result for query: {query}"] * k
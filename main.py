@@ -1,67 +1,131 @@
 import os
 import sys
 import time
-import tempfile
+import asyncio
 
 # Add the parent directory to the Python path to allow imports from stt, chat, and tts
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
-from stt import record_audio, transcribe_audio
-from chat import get_bot_response
+from stt import record_audio, transcribe_array, warmup_whisper_model, WHISPER_SAMPLE_RATE
+from chat import stream_bot_response_async, warm_connection_async, close_client, GeminiTimeoutError
 from tts import speak_text
+from utils import split_sentences
 
-def main():
-    print("Starting the Voice AI loop. Press 'n' to exit after each round.")
+# Whisper model to transcribe with
+WHISPER_MODEL = os.environ.get('WHISPER_MODEL', 'base')
+
+async def speak_worker(speech_queue):
+    """
+    Speak sentences from the queue one at a time until a None sentinel arrives.
+    
+    Args:
+        speech_queue (asyncio.Queue): Sentences to speak, in order
+    """
     while True:
+        sentence = await speech_queue.get()
         try:
-            print("\nRecording your voice for 5 seconds...")
-            # Record audio to a temporary file
-            temp_dir = tempfile.gettempdir()
-            temp_filename = os.path.join(temp_dir, f"voice_recording_{os.getpid()}.wav")
-            success = record_audio(temp_filename, duration=5, sample_rate=16000)
-            if not success:
-                print("No speech detected or failed to record audio. Please try again.")
-                continue
+            if sentence is None:
+                return
+            await asyncio.to_thread(speak_text, sentence)
+        finally:
+            speech_queue.task_done()
+
+async def respond(user_query, speech_queue):
+    """
+    Stream the bot's reply, queueing each complete sentence for speech as soon as it arrives.
+    
+    Args:
+        user_query (str): The user's transcribed question
+        speech_queue (asyncio.Queue): Queue consumed by speak_worker
+        
+    Returns:
+        str: The full response text (empty if the bot produced nothing)
+    """
+    chunks = []
+    pending = ""
+    async for chunk in stream_bot_response_async(user_query):
+        if not chunks:
+            print("Bot says: ", end="", flush=True)
+        print(chunk, end="", flush=True)
+        chunks.append(chunk)
+        
+        sentences, pending = split_sentences(pending + chunk)
+        for sentence in sentences:
+            await speech_queue.put(sentence)
+    
+    if pending.strip():
+        await speech_queue.put(pending)
+    if chunks:
+        print()
+    return "".join(chunks)
 
-            # Transcribe the recorded audio
-            user_query = transcribe_audio(temp_filename)
-            print(f"You said: {user_query}")
+async def main_async():
+    print("Starting the Voice AI loop. Press 'n' to exit after each round.")
+    # Load Whisper in the background while the first recording is made
+    warmup = asyncio.create_task(asyncio.to_thread(warmup_whisper_model, WHISPER_MODEL))
+    
+    # Open the Gemini connection now so the first answer skips DNS + TLS setup
+    await warm_connection_async()
+    
+    # TTS runs as its own stage so speech starts while the reply is still generating
+    speech_queue = asyncio.Queue()
+    speaker = asyncio.create_task(speak_worker(speech_queue))
+    
+    try:
+        while True:
+            try:
+                print("\nRecording your voice for 5 seconds...")
+                audio_data = await asyncio.to_thread(record_audio, duration=5, sample_rate=WHISPER_SAMPLE_RATE)
+                if audio_data is None:
+                    print("No speech detected or failed to record audio. Please try again.")
+                    continue
 
-            # Clean up temporary file
-            if os.path.exists(temp_filename):
-                os.unlink(temp_filename)
+                # Transcribe the recorded samples directly, no WAV round-trip
+                user_query = await asyncio.to_thread(
+                    transcribe_array, audio_data, WHISPER_SAMPLE_RATE, None, WHISPER_MODEL
+                )
+                print(f"You said: {user_query}")
 
-            if not user_query:
-                print("Could not transcribe audio. Please try again.")
-                continue
+                if not user_query:
+                    print("Could not transcribe audio. Please try again.")
+                    continue
 
-            if user_query.lower() == 'exit':
-                print("Exiting the Voice AI loop.")
-                break
+                if user_query.lower() == 'exit':
+                    print("Exiting the Voice AI loop.")
+                    break
 
-            print("Getting bot response...")
-            bot_response = get_bot_response(user_query)
-            if not bot_response:
-                print("Bot failed to generate a response.")
-                continue
-            print(f"Bot says: {bot_response}")
+                print("Getting bot response...")
+                bot_response = await respond(user_query, speech_queue)
+                if not bot_response:
+                    print("Bot failed to generate a response.")
+                    continue
 
-            print("Speaking bot response...")
-            speak_text(bot_response)
+            except GeminiTimeoutError:
+                print("The model is taking longer than usual to respond. Please try again.")
+            except Exception as e:
+                print(f"An error occurred: {e}")
+                print("Please ensure your microphone is working and necessary models are loaded.")
+            finally:
+                # Let the reply finish before the mic opens again so it isn't recorded
+                await speech_queue.join()
 
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            print("Please ensure your microphone is working and necessary models are loaded.")
+            while True:
+                choice = (await asyncio.to_thread(input, "Do you want to continue? (y/n): ")).lower()
+                if choice == 'n':
+                    print("Exiting the Voice AI loop.")
+                    return
+                elif choice == 'y':
+                    break
+                else:
+                    print("Invalid input. Please type 'y' or 'n'.")
+    finally:
+        await speech_queue.put(None)
+        await speaker
+        await warmup
+        await close_client()
 
-        while True:
-            choice = input("Do you want to continue? (y/n): ").lower()
-            if choice == 'n':
-                print("Exiting the Voice AI loop.")
-                return
-            elif choice == 'y':
-                break
-            else:
-                print("Invalid input. Please type 'y' or 'n'.")
+def main():
+    asyncio.run(main_async())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -9,23 +9,50 @@ It provides functionality to capture audio from the microphone and transcribe it
 """
 
 import os
-import tempfile
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
 import numpy as np
+import torch
 import whisper
 import sounddevice as sd
-from scipy.io.wavfile import write as write_wav
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Global model instance for performance (load once)
-_whisper_model = None
+# Sample rate Whisper models are trained on
+WHISPER_SAMPLE_RATE = 16000
+
+# Mean absolute int16 amplitude below which audio counts as silence
+# (about 0.001 of full scale)
+SILENCE_THRESHOLD = 32
+
+# Voice activity detection runs on FRAME_SECONDS blocks and ends the
+# recording after END_SILENCE_SECONDS of silence following speech
+FRAME_SECONDS = 0.02
+END_SILENCE_SECONDS = 2.0
+
+# Whisper loads onto the GPU when one is available, where half precision
+# halves the size of its activations
+USE_FP16 = torch.cuda.is_available()
+
+# Loaded models by name, so each is loaded once per process
+_whisper_models = {}
+_model_lock = threading.Lock()
+
+# Transcriptions keyed by a hash of the audio samples: an on-disk store plus
+# an in-memory LRU of the most recent STT_CACHE_SIZE entries in front of it
+STT_CACHE_DIR = Path.home() / ".cache" / "voiceai" / "stt"
+STT_CACHE_SIZE = 1000
+_transcription_cache = OrderedDict()
+_cache_lock = threading.Lock()
 
 def get_whisper_model(model_name='base'):
     """
-    Get or initialize the Whisper model (singleton pattern).
+    Get or initialize a Whisper model, loading each model name once per process.
     
     Args:
         model_name (str): Name of the Whisper model to use ('tiny', 'base', 'small', 'medium', 'large')
@@ -33,65 +60,156 @@ def get_whisper_model(model_name='base'):
     Returns:
         whisper.Model: Loaded Whisper model
     """
-    global _whisper_model
+    model = _whisper_models.get(model_name)
+    if model is None:
+        # A background warmup and the first caller may race to load
+        with _model_lock:
+            model = _whisper_models.get(model_name)
+            if model is None:
+                try:
+                    logger.info(f"Loading Whisper model: {model_name}")
+                    model = _whisper_models[model_name] = whisper.load_model(model_name)
+                    logger.info("Whisper model loaded successfully")
+                except Exception as e:
+                    logger.error(f"Error loading Whisper model: {str(e)}")
+                    raise
     
-    if _whisper_model is None:
-        try:
-            logger.info(f"Loading Whisper model: {model_name}")
-            _whisper_model = whisper.load_model(model_name)
-            logger.info("Whisper model loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading Whisper model: {str(e)}")
-            raise
+    return model
+
+def _transcription_key(audio_data, sample_rate):
+    """
+    Content hash identifying a recording.
+    
+    Args:
+        audio_data (np.ndarray): Raw audio samples
+        sample_rate (int): Sample rate of audio_data
+        
+    Returns:
+        str: Hex SHA-256 digest of the samples, their dtype and the sample rate
+    """
+    h = hashlib.sha256(f"{audio_data.dtype.str}:{sample_rate}:".encode())
+    h.update(np.ascontiguousarray(audio_data).tobytes())
+    return h.hexdigest()
+
+def _cache_get(key):
+    """
+    Look up a cached transcription, promoting disk hits into memory.
+    
+    Args:
+        key (str): Key from _transcription_key
+        
+    Returns:
+        str: Cached transcription, or None on a miss
+    """
+    with _cache_lock:
+        transcription = _transcription_cache.get(key)
+        if transcription is not None:
+            _transcription_cache.move_to_end(key)
+            return transcription
+    
+    try:
+        transcription = (STT_CACHE_DIR / f"{key}.txt").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    _cache_put(key, transcription, persist=False)
+    return transcription
+
+def _cache_put(key, transcription, persist=True):
+    """
+    Store a transcription, evicting the least recently used in-memory entry when full.
+    
+    Args:
+        key (str): Key from _transcription_key
+        transcription (str): Transcribed text
+        persist (bool): Also write the transcription to STT_CACHE_DIR
+    """
+    with _cache_lock:
+        _transcription_cache[key] = transcription
+        _transcription_cache.move_to_end(key)
+        if len(_transcription_cache) > STT_CACHE_SIZE:
+            _transcription_cache.popitem(last=False)
     
-    return _whisper_model
+    if persist:
+        try:
+            STT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (STT_CACHE_DIR / f"{key}.txt").write_text(transcription, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not write transcription cache: {str(e)}")
 
-def record_audio(filename, duration=5, sample_rate=16000):
+def record_audio(duration=5, sample_rate=16000):
     """
-    Record audio from the microphone and save to a file.
+    Record audio from the microphone.
+    
+    Recording stops early once END_SILENCE_SECONDS of silence follow speech,
+    so short utterances don't wait out the full duration. The samples stay
+    in memory and can be passed straight to transcribe_array.
     
     Args:
-        filename (str): Path to save the recorded audio file
-        duration (int): Duration of recording in seconds
+        duration (int): Maximum duration of recording in seconds
         sample_rate (int): Sample rate for recording
         
     Returns:
-        bool: True if recording was successful, False otherwise
+        np.ndarray: Mono int16 samples, or None if no speech was detected or recording failed
     """
     try:
-        logger.info(f"Recording audio for {duration} seconds...")
+        logger.info(f"Recording audio for up to {duration} seconds...")
+        
+        frames = []
+        max_samples = int(duration * sample_rate)
+        end_silence = int(END_SILENCE_SECONDS * sample_rate)
+        captured = 0
+        silent = 0
+        heard_speech = False
+        finished = threading.Event()
         
-        # Record audio from microphone
-        audio_data = sd.rec(
-            int(duration * sample_rate),
+        def callback(indata, frame_count, time_info, status):
+            nonlocal captured, silent, heard_speech
+            if status:
+                logger.warning(f"Audio input status: {status}")
+            
+            frames.append(indata.copy())
+            captured += frame_count
+            
+            # Frame-level energy threshold; mean |x| > SILENCE_THRESHOLD counts as speech
+            if np.abs(indata).sum() > SILENCE_THRESHOLD * frame_count:
+                heard_speech = True
+                silent = 0
+            else:
+                silent += frame_count
+            
+            if captured >= max_samples or (heard_speech and silent >= end_silence):
+                raise sd.CallbackStop
+        
+        # Record audio from microphone in 20 ms frames
+        with sd.InputStream(
             samplerate=sample_rate,
             channels=1,
-            dtype='float32'
-        )
-        sd.wait()  # Wait until recording is finished
+            dtype='int16',  # Native mic format, half the size of float32
+            blocksize=int(sample_rate * FRAME_SECONDS),
+            callback=callback,
+            finished_callback=finished.set
+        ):
+            finished.wait(timeout=duration + 1)
         
-        # Check if audio contains speech (simple energy threshold)
-        energy = np.mean(np.abs(audio_data))
-        logger.info(f"Audio energy level: {energy}")
-        if energy < 0.001:  # Lower threshold to be more sensitive
+        logger.info(f"Captured {captured / sample_rate:.2f} seconds of audio")
+        if not heard_speech:
             logger.info("No speech detected")
-            return False
+            return None
         
-        # Save audio to file
-        logger.info(f"Saving audio to {filename}")
-        write_wav(filename, sample_rate, audio_data)
-        return True
+        return np.concatenate(frames).reshape(-1)
         
     except Exception as e:
         logger.error(f"Error recording audio: {str(e)}")
-        return False
+        return None
 
-def transcribe_audio(file_path):
+def transcribe_audio(file_path, model=None, model_name='base'):
     """
     Transcribe audio file to text using Whisper.
     
     Args:
         file_path (str): Path to the audio file (WAV or MP3)
+        model (whisper.Model): Loaded model to use
+        model_name (str): Model to load (once per process) if model isn't given
         
     Returns:
         str: Transcribed text, or empty string if transcription failed
@@ -101,10 +219,6 @@ def transcribe_audio(file_path):
         return ""
     
     try:
-        # Get or initialize the model
-        model = get_whisper_model()
-        
-        # Transcribe audio
         logger.info(f"Transcribing audio file: {file_path}")
         # Verify file exists and print absolute path for debugging
         abs_path = os.path.abspath(file_path)
@@ -113,19 +227,63 @@ def transcribe_audio(file_path):
         # Load audio directly using scipy instead of whisper.load_audio
         import scipy.io.wavfile as wav
         sample_rate, audio_data = wav.read(abs_path)
-        # Convert to float32 and normalize if needed
+        
+        return transcribe_array(audio_data, sample_rate, model, model_name)
+        
+    except Exception as e:
+        logger.error(f"Error transcribing audio: {str(e)}")
+        return ""
+
+def transcribe_array(audio_data, sample_rate=WHISPER_SAMPLE_RATE, model=None, model_name='base'):
+    """
+    Transcribe in-memory audio samples to text using Whisper.
+    
+    Args:
+        audio_data (np.ndarray): int16 or float32 samples, mono or multi-channel
+        sample_rate (int): Sample rate of audio_data
+        model (whisper.Model): Loaded model to use
+        model_name (str): Model to load (once per process) if model isn't given
+        
+    Returns:
+        str: Transcribed text, or empty string if transcription failed
+    """
+    try:
+        # A repeated recording skips Whisper entirely
+        key = _transcription_key(audio_data, sample_rate)
+        cached = _cache_get(key)
+        if cached is not None:
+            logger.info("Transcription served from cache")
+            return cached
+        
+        # Get or initialize the model
+        if model is None:
+            model = get_whisper_model(model_name)
+        
+        # Convert to float32 and normalize if needed, only at the Whisper boundary
         if audio_data.dtype != np.float32:
             audio_data = audio_data.astype(np.float32) / (2**15 if audio_data.dtype == np.int16 else 1)
         
+        # Whisper expects mono audio at 16 kHz
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1)
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            duration = len(audio_data) / sample_rate
+            target = np.linspace(0, duration, int(duration * WHISPER_SAMPLE_RATE), endpoint=False)
+            source = np.arange(len(audio_data)) / sample_rate
+            audio_data = np.interp(target, source, audio_data).astype(np.float32)
+        
         # Transcribe the loaded audio data
         result = model.transcribe(
             audio_data,
-            fp16=False  # Use fp16=True if you have GPU support
+            fp16=USE_FP16
         )
         
         transcription = result["text"].strip()
         logger.info(f"Transcription complete: {transcription[:50]}..." if len(transcription) > 50 else f"Transcription complete: {transcription}")
         
+        if transcription:
+            _cache_put(key, transcription)
+        
         return transcription
         
     except Exception as e:
@@ -167,30 +325,12 @@ class SpeechToText:
         self.logger.info(f"Recording audio for {self.record_duration} seconds...")
         
         try:
-            # Create a temporary file for the recording
-            temp_dir = tempfile.gettempdir()
-            temp_filename = os.path.join(temp_dir, f"whisper_recording_{os.getpid()}.wav")
-            self.logger.info(f"Using temporary file: {temp_filename}")
+            # Record and transcribe in memory
+            audio_data = record_audio(self.record_duration, self.sample_rate)
+            if audio_data is None:
+                return ""
             
-            # Record audio to the temporary file
-            if record_audio(temp_filename, self.record_duration, self.sample_rate):
-                # Verify file exists before transcription
-                if os.path.exists(temp_filename):
-                    self.logger.info(f"Temporary file exists, size: {os.path.getsize(temp_filename)} bytes")
-                    # Transcribe the recorded audio
-                    transcription = transcribe_audio(temp_filename)
-                else:
-                    self.logger.error(f"Temporary file not found: {temp_filename}")
-                    transcription = ""
-            else:
-                transcription = ""
-            
-            # Clean up temporary file
-            if os.path.exists(temp_filename):
-                os.unlink(temp_filename)
-                self.logger.info(f"Removed temporary file: {temp_filename}")
-            
-            return transcription
+            return transcribe_array(audio_data, self.sample_rate, self.model)
             
         except Exception as e:
             self.logger.error(f"Error in speech recognition: {str(e)}")
@@ -201,4 +341,21 @@ class SpeechToText:
         Clean up resources used by the STT engine.
         """
         self.logger.info("Cleaning up STT resources")
-        # Any cleanup code would go here
\ No newline at end of file
+        # Any cleanup code would go here
+
+def warmup_whisper_model(model_name='base'):
+    """
+    Load the Whisper model and run a silent transcription to warm it up.
+    
+    The first inference pays for CUDA kernel selection and cuDNN autotuning;
+    doing it here keeps that cost off the user's first utterance.
+    
+    Args:
+        model_name (str): Name of the Whisper model to load
+    """
+    try:
+        model = get_whisper_model(model_name)
+        model.transcribe(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), fp16=USE_FP16)
+        logger.info("Whisper model warmed up")
+    except Exception as e:
+        logger.warning(f"Whisper preload failed: {str(e)}")
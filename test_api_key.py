@@ -15,8 +15,14 @@ import json
 import logging
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,17 +31,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pooled session so repeated test calls reuse the kept-alive TLS connection
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, pool_block=False))
+_session.headers.update({"Content-Type": "application/json"})
+
+# Key found by get_api_key; a miss isn't kept, so a key added later is seen
+_api_key = None
+
 
 def get_api_key():
     """
     Get the OpenAI API key from environment variable or config file.
     
+    A key once found is cached, so repeat calls in the same process skip
+    the environment and config file lookups.
+    
     Returns:
         str: The API key or None if not found
     """
+    global _api_key
+    if _api_key:
+        return _api_key
+    
     # Try environment variable first
     api_key = os.environ.get("OPENAI_API_KEY")
     if api_key:
+        _api_key = api_key
         return api_key
     
     # Try config file
@@ -43,10 +65,11 @@ def get_api_key():
     for config_path in config_paths:
         try:
             if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
+                data = Path(config_path).read_bytes()
+                config = orjson.loads(data) if orjson else json.loads(data)
                 api_key = config.get("openai", {}).get("api_key")
                 if api_key:
+                    _api_key = api_key
                     return api_key
         except Exception as e:
             logger.error(f"Error reading config file {config_path}: {str(e)}")
@@ -75,11 +98,8 @@ def test_api_key(api_key=None, model="gpt-3.5-turbo"):
     # API endpoint
     url = "https://api.openai.com/v1/chat/completions"
     
-    # Headers
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+    # Headers (Content-Type is set on the session)
+    headers = {"Authorization": f"Bearer {api_key}"}
     
     # Test message
     data = {
@@ -100,7 +120,7 @@ def test_api_key(api_key=None, model="gpt-3.5-turbo"):
         start_time = time.time()
         
         # Make API call
-        response = requests.post(url, headers=headers, json=data)
+        response = _session.post(url, headers=headers, json=data)
         
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
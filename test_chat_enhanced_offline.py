@@ -9,20 +9,67 @@ conversation history features without making actual API calls to OpenAI.
 """
 
 import os
+import re
 import sys
+import time
+import atexit
 import argparse
 import uuid
 import json
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# orjson is several times faster than json for the history log; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The append-only history log is rewritten to just the current messages
+# once it grows past this many times the history limit
+COMPACT_FACTOR = 4
+
+# History logs are only touched from this worker, so the chat loop never
+# waits on disk; one worker keeps each session's writes in order
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-writer")
+
+# Managers still open, closed at exit so buffered appends reach the disk
+_live_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all():
+    for manager in list(_live_managers):
+        manager.close()
+
+
+def _dumps(obj):
+    """
+    Serialize an object to compact JSON bytes.
+    """
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data):
+    """
+    Parse JSON bytes.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class SimpleConversationManager:
     """
     A simplified conversation manager for demonstration purposes.
     """
     
-    def __init__(self, session_id, max_history=10, save_history=True):
+    def __init__(self, session_id, max_history=10, save_history=True, history_files=None):
         """
         Initialize the conversation manager.
         
@@ -30,19 +77,70 @@ class SimpleConversationManager:
             session_id: Unique identifier for this conversation session
             max_history: Maximum number of messages to keep in history
             save_history: Whether to save history to disk
+            history_files: Names of the files already in the history directory,
+                if the caller has listed it (see bulk_load)
         """
         self.session_id = session_id
         self.max_history = max_history
         self.save_history = save_history
-        self.messages = []
+        # System messages are kept apart so the rest can live in a bounded
+        # deque that drops the oldest message itself once full
+        self._system = []
+        self._non_system = deque(maxlen=max_history)
         self.history_dir = Path("conversation_history")
         
+        # Writes are coalesced: the first change is saved immediately, later
+        # ones at most once per flush interval, and anything left at exit
+        self._dirty = False
+        self._last_flush = 0.0
+        self._flush_interval = 1.0
+        
+        # Messages not yet appended to the log, lines already in it, and
+        # whether the log must be rewritten rather than appended to
+        self._pending = []
+        self._file_lines = 0
+        self._rewrite = False
+        
+        # Log handle, opened on the first write and kept open for the
+        # session; appends sit in its 64 KiB buffer until a checkpoint
+        # (clear, close, compaction)
+        self._fh = None
+        self._writer = _writer if save_history else None
+        
         # Create history directory if it doesn't exist
-        if self.save_history:
+        if self.save_history and history_files is None:
             self.history_dir.mkdir(exist_ok=True)
         
         # Load existing history if available
-        self._load_history()
+        self._load_history(history_files)
+        
+        if self.save_history:
+            _live_managers.add(self)
+    
+    @classmethod
+    def bulk_load(cls, session_ids, max_history=10, save_history=True):
+        """
+        Create managers for several sessions with one scan of the history directory.
+        
+        Args:
+            session_ids: Session IDs to load
+            max_history: Maximum number of messages to keep in history
+            save_history: Whether to save history to disk
+            
+        Returns:
+            List of SimpleConversationManager, in the order of session_ids
+        """
+        history_files = set()
+        if save_history:
+            history_dir = Path("conversation_history")
+            history_dir.mkdir(exist_ok=True)
+            with os.scandir(history_dir) as entries:
+                history_files = {entry.name for entry in entries}
+        
+        return [
+            cls(session_id, max_history, save_history, history_files=history_files)
+            for session_id in session_ids
+        ]
     
     def add_message(self, role, content):
         """
@@ -52,32 +150,35 @@ class SimpleConversationManager:
             role: Message role ("system", "user", or "assistant")
             content: Message content
         """
-        self.messages.append({"role": role, "content": content})
-        
-        # Trim history if it exceeds max_history
-        if len(self.messages) > self.max_history + 1:  # +1 for system message
-            system_messages = [m for m in self.messages if m["role"] == "system"]
-            non_system = [m for m in self.messages if m["role"] != "system"]
-            
-            # Keep only the most recent messages
-            keep_count = self.max_history - len(system_messages)
-            recent_messages = non_system[-keep_count:] if keep_count > 0 else []
-            
-            # Reconstruct messages list with system messages first, then recent messages
-            self.messages = system_messages + recent_messages
+        message = {"role": role, "content": content}
+        self._store(message)
+        self._pending.append(message)
         
         # Save updated history
-        if self.save_history:
-            self._save_history()
+        self._dirty = True
+        self._maybe_flush()
+    
+    def _store(self, message):
+        """
+        Keep a message in history, dropping the oldest non-system message once
+        more than max_history are held.
+        
+        Args:
+            message: Message dictionary
+        """
+        if message["role"] == "system":
+            self._system.append(message)
+        else:
+            self._non_system.append(message)
     
     def get_messages(self):
         """
         Get the current conversation messages.
         
         Returns:
-            List of message dictionaries
+            List of message dictionaries, system messages first
         """
-        return self.messages
+        return self._system + list(self._non_system)
     
     def clear_history(self, keep_system=True):
         """
@@ -86,14 +187,15 @@ class SimpleConversationManager:
         Args:
             keep_system: Whether to keep system messages
         """
-        if keep_system:
-            self.messages = [m for m in self.messages if m["role"] == "system"]
-        else:
-            self.messages = []
+        self._non_system.clear()
+        if not keep_system:
+            self._system = []
         
         # Save updated (empty) history
-        if self.save_history:
-            self._save_history()
+        self._rewrite = True
+        self._dirty = True
+        self._flush()
+        self._submit(self._sync_log).result()
         print(f"Cleared conversation history for session {self.session_id}")
     
     def _get_history_path(self):
@@ -103,43 +205,260 @@ class SimpleConversationManager:
         Returns:
             Path object for the history file
         """
-        return self.history_dir / f"{self.session_id}.json"
+        return self.history_dir / f"{self.session_id}.jsonl"
     
-    def _load_history(self):
+    def _load_history(self, history_files=None):
         """
         Load conversation history from disk if it exists.
+        
+        The log is replayed through the same trimming as add_message. History
+        saved by older versions as a single JSON array is migrated. Lines
+        that don't parse (a write torn by a crash) are dropped and the log is
+        rewritten, so later appends never land on a partial line.
+        
+        Args:
+            history_files: Names of the files in the history directory, or
+                None to check the disk for this session's files
         """
         if not self.save_history:
             return
             
         history_path = self._get_history_path()
+        legacy_path = history_path.with_suffix('.json')
         
-        if history_path.exists():
-            try:
-                with open(history_path, 'r') as f:
-                    self.messages = json.load(f)
+        # Open instead of checking first: one syscall, and no window for the
+        # file to vanish in between
+        try:
+            if history_files is None or history_path.name in history_files:
+                try:
+                    with open(history_path, 'rb') as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    pass
+                else:
+                    damaged = bool(data) and not data.endswith(b"\n")
+                    for line in data.splitlines():
+                        if not line.strip():
+                            continue
+                        try:
+                            self._store(_loads(line))
+                        except ValueError:
+                            damaged = True
+                            continue
+                        self._file_lines += 1
+                    if damaged:
+                        print(f"Dropped unreadable lines from {history_path}")
+                        self._rewrite = True
+                        self._dirty = True
+                        self._flush()
+                    print(f"Loaded conversation history for session {self.session_id}")
+                    return
+            
+            if history_files is None or legacy_path.name in history_files:
+                try:
+                    with open(legacy_path, 'rb') as f:
+                        messages = _loads(f.read())
+                except FileNotFoundError:
+                    return
+                for message in messages:
+                    self._store(message)
+                self._rewrite = True
+                self._dirty = True
+                self._flush()
                 print(f"Loaded conversation history for session {self.session_id}")
-            except Exception as e:
-                print(f"Error loading conversation history: {str(e)}")
-                self.messages = []
+        except Exception as e:
+            print(f"Error loading conversation history: {str(e)}")
+            self._system = []
+            self._non_system.clear()
+    
+    def close(self):
+        """
+        Write out pending messages and close the history log.
+        """
+        self._flush()
+        self._submit(self._close_log).result()
+        _live_managers.discard(self)
+    
+    def _submit(self, fn, *args):
+        """
+        Run a log operation on the writer thread, or inline once it has shut down.
+        
+        Args:
+            fn: Function to call
+            *args: Arguments for fn
+            
+        Returns:
+            Future for the call's result
+        """
+        if self._writer:
+            try:
+                return self._writer.submit(fn, *args)
+            except RuntimeError:
+                # At interpreter exit the worker is stopped before atexit
+                # handlers such as close() run
+                self._writer = None
+        
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+    
+    def _open_log(self):
+        """
+        Open the history log for buffered appends, unless it is already open.
+        """
+        if self._fh:
+            return
+        
+        try:
+            self._fh = open(self._get_history_path(), 'ab', buffering=65536)
+        except Exception as e:
+            print(f"Error opening conversation history: {str(e)}")
+            self._fh = None
+    
+    def _sync_log(self):
+        """
+        Push buffered appends to the file.
+        """
+        if self._fh:
+            self._fh.flush()
+    
+    def _close_log(self):
+        """
+        Close the history log.
+        """
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+    
+    def _maybe_flush(self):
+        """
+        Save pending changes if the flush interval has elapsed since the last save.
+        """
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self._flush()
+    
+    def _flush(self):
+        """
+        Save pending changes to disk now.
+        """
+        if not self._dirty:
+            return
+        
+        if self._rewrite or self._file_lines + len(self._pending) > COMPACT_FACTOR * (self.max_history + 1):
+            self._save_history()
+        else:
+            self._append_messages(self._pending)
+        self._pending = []
+        self._dirty = False
+        self._last_flush = time.monotonic()
+    
+    def _append_messages(self, messages):
+        """
+        Append messages to the history log, one JSON object per line.
+        
+        The messages are encoded here and written on the writer thread.
+        
+        Args:
+            messages: Message dictionaries to append
+        """
+        if not self.save_history or not messages:
+            return
+        
+        self._submit(self._write_log, b"".join(_dumps(m) + b"\n" for m in messages))
+        self._file_lines += len(messages)
+    
+    def _write_log(self, data):
+        """
+        Write encoded lines to the history log.
+        
+        Args:
+            data: Bytes to append
+        """
+        self._open_log()
+        if not self._fh:
+            return
+        
+        try:
+            self._fh.write(data)
+        except Exception as e:
+            print(f"Error saving conversation history: {str(e)}")
     
     def _save_history(self):
         """
-        Save conversation history to disk.
+        Rewrite the history log to contain only the current messages.
+        
+        The messages are encoded here and written on the writer thread.
         """
+        self._rewrite = False
         if not self.save_history:
             return
         
+        messages = self.get_messages()
+        self._submit(self._replace_log, b"".join(_dumps(m) + b"\n" for m in messages))
+        self._file_lines = len(messages)
+    
+    def _replace_log(self, data):
+        """
+        Replace the history log with encoded lines.
+        
+        The log is written to a temporary file and renamed over the old one,
+        so an interrupted save never leaves a truncated file behind.
+        
+        Args:
+            data: Complete contents of the new log
+        """
         history_path = self._get_history_path()
+        tmp_path = history_path.with_suffix('.tmp')
+        
+        # The rename replaces the file under the open handle, so close it first
+        self._close_log()
         
         try:
-            with open(history_path, 'w') as f:
-                json.dump(self.messages, f, indent=2)
+            # The whole log is handed straight to the OS, skipping the
+            # buffered file object for a one-shot write
+            buf = memoryview(data)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while buf:
+                    buf = buf[os.write(fd, buf):]
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, history_path)
             # print(f"Saved conversation history for session {self.session_id}")
         except Exception as e:
             print(f"Error saving conversation history: {str(e)}")
 
 
+# Keywords recognised by simulate_bot_response and the response category each selects
+_KEYWORD_CATEGORIES = {
+    "hello": "greeting", "hi": "greeting",
+    "insurance": "insurance",
+    "claim": "claim", "claims": "claim",
+    "price": "price", "prices": "price", "cost": "price", "costs": "price",
+    "quote": "price", "quotes": "price",
+    "thank": "thanks", "thanks": "thanks",
+    "history": "history",
+}
+
+# When several categories match, the first one listed here wins
+_CATEGORY_PRIORITY = ["greeting", "insurance", "claim", "price", "thanks", "history"]
+
+# All keywords as whole words in one case-insensitive pattern, so an input
+# is scanned once instead of once per keyword
+_KEYWORD_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, _KEYWORD_CATEGORIES)) + r")\b",
+    re.IGNORECASE
+)
+
+_RESPONSES = {
+    "greeting": "Hello! How can I help you with your insurance needs today?",
+    "insurance": "We offer various insurance products including auto, home, life, and health insurance. Would you like more information about any specific type?",
+    "claim": "To file a claim, you'll need your policy number, date of incident, and relevant documentation. Would you like me to guide you through the process?",
+    "price": "Insurance prices vary based on many factors including coverage type, history, and location. I can help you get a personalized quote if you provide more details.",
+    "thanks": "You're welcome! Is there anything else I can help you with?",
+}
+
+
 def simulate_bot_response(user_input, conversation):
     """
     Simulate a bot response without making API calls.
@@ -155,24 +474,19 @@ def simulate_bot_response(user_input, conversation):
     conversation.add_message("user", user_input)
     
     # Generate a simple response based on the input
-    if "hello" in user_input.lower() or "hi" in user_input.lower():
-        response = "Hello! How can I help you with your insurance needs today?"
-    elif "insurance" in user_input.lower():
-        response = "We offer various insurance products including auto, home, life, and health insurance. Would you like more information about any specific type?"
-    elif "claim" in user_input.lower():
-        response = "To file a claim, you'll need your policy number, date of incident, and relevant documentation. Would you like me to guide you through the process?"
-    elif "price" in user_input.lower() or "cost" in user_input.lower() or "quote" in user_input.lower():
-        response = "Insurance prices vary based on many factors including coverage type, history, and location. I can help you get a personalized quote if you provide more details."
-    elif "thank" in user_input.lower():
-        response = "You're welcome! Is there anything else I can help you with?"
-    elif "history" in user_input.lower():
+    categories = {_KEYWORD_CATEGORIES[k.lower()] for k in _KEYWORD_RE.findall(user_input)}
+    category = next((c for c in _CATEGORY_PRIORITY if c in categories), None)
+    
+    if category == "history":
         # Show conversation history
         messages = conversation.get_messages()
-        response = f"Here's our conversation history ({len(messages)} messages):\n"
+        parts = [f"Here's our conversation history ({len(messages)} messages):\n"]
         for i, msg in enumerate(messages):
             if msg["role"] != "system":
-                response += f"\n{i}. {msg['role'].upper()}: {msg['content'][:50]}{'...' if len(msg['content']) > 50 else ''}"
-        return response
+                parts.append(f"\n{i}. {msg['role'].upper()}: {msg['content'][:50]}{'...' if len(msg['content']) > 50 else ''}")
+        return "".join(parts)
+    elif category:
+        response = _RESPONSES[category]
     else:
         response = "I understand you're asking about '" + user_input + "'. As this is an offline demo, I can only provide limited responses. In the full version, I would connect to OpenAI's GPT-4o for more helpful answers."
     
@@ -181,6 +495,26 @@ def simulate_bot_response(user_input, conversation):
     return response
 
 
+# Printed with one write each rather than a print() per line
+_BANNER = """
+===== Conversation Management Offline Test =====
+
+Session ID: {session_id}
+Type 'exit', 'quit', or Ctrl+C to end the conversation.
+Type 'clear' to clear conversation history.
+Type 'history' to view conversation history.
+Type 'help' to see all available commands.
+"""
+
+_HELP = """
+Available commands:
+  exit, quit - End the conversation
+  clear - Clear conversation history
+  history - Show conversation history
+  help - Show this help message
+"""
+
+
 def main():
     """
     Main function to test the conversation management features.
@@ -194,12 +528,7 @@ def main():
     # Generate or use provided session ID
     session_id = args.session if args.session else str(uuid.uuid4())
     
-    print("\n===== Conversation Management Offline Test =====\n")
-    print(f"Session ID: {session_id}")
-    print("Type 'exit', 'quit', or Ctrl+C to end the conversation.")
-    print("Type 'clear' to clear conversation history.")
-    print("Type 'history' to view conversation history.")
-    print("Type 'help' to see all available commands.\n")
+    print(_BANNER.format(session_id=session_id))
     
     # Initialize conversation manager
     conversation = SimpleConversationManager(
@@ -221,21 +550,18 @@ def main():
             user_input = input("You: ")
             
             # Process commands
-            if user_input.lower() in ["exit", "quit"]:
+            command = user_input.lower()
+            if command in ("exit", "quit"):
                 print("\nExiting chat. Goodbye!")
                 break
                 
-            elif user_input.lower() == "clear":
+            elif command == "clear":
                 conversation.clear_history()
                 print("\nConversation history cleared.\n")
                 continue
                 
-            elif user_input.lower() == "help":
-                print("\nAvailable commands:")
-                print("  exit, quit - End the conversation")
-                print("  clear - Clear conversation history")
-                print("  history - Show conversation history")
-                print("  help - Show this help message\n")
+            elif command == "help":
+                print(_HELP)
                 continue
             
             # Get simulated response
@@ -246,6 +572,8 @@ def main():
     
     except KeyboardInterrupt:
         print("\n\nExiting chat. Goodbye!")
+    finally:
+        conversation.close()
     
     return 0
 
@@ -7,28 +7,26 @@ Test Script for Speech-to-Text Module
 This script demonstrates how to use the speech-to-text functionality.
 """
 
-import os
 import argparse
-from stt import record_audio, transcribe_audio, SpeechToText
+from stt import record_audio, transcribe_array, SpeechToText
 from utils import get_config
 
 def test_standalone_functions():
     """
-    Test the standalone record_audio and transcribe_audio functions.
+    Test the standalone record_audio and transcribe_array functions.
     """
     print("\n=== Testing Standalone Functions ===\n")
     
-    # Create a temporary recording
-    temp_file = "temp_recording.wav"
-    print(f"Recording audio to {temp_file}...")
+    print("Recording audio...")
     print("Please speak for 5 seconds...")
     
-    if record_audio(temp_file, duration=5):
+    audio_data = record_audio(duration=5)
+    if audio_data is not None:
         print("Recording successful!")
         
         # Transcribe the recording
         print("\nTranscribing audio...")
-        transcription = transcribe_audio(temp_file)
+        transcription = transcribe_array(audio_data)
         
         if transcription:
             print(f"Transcription: {transcription}")
@@ -36,11 +34,6 @@ def test_standalone_functions():
             print("Transcription failed or returned empty result.")
     else:
         print("Recording failed or no speech detected.")
-    
-    # Clean up
-    if os.path.exists(temp_file):
-        os.remove(temp_file)
-        print(f"Removed temporary file: {temp_file}")
 
 def test_stt_class():
     """
@@ -1,11 +1,18 @@
-from stt import record_audio, transcribe_audio
+import threading
+
+from stt import record_audio, transcribe_array, warmup_whisper_model
 
 if __name__ == "__main__":
+    # Load the model while the user is speaking rather than after
+    warmup = threading.Thread(target=warmup_whisper_model, daemon=True)
+    warmup.start()
+    
     print("Recording... Speak into the mic.")
-    record_audio("test_audio.wav", duration=5)  # You can adjust duration
+    audio_data = record_audio(duration=5)  # You can adjust duration
     
     print("Transcribing...")
-    result = transcribe_audio("test_audio.wav")
+    warmup.join()
+    result = transcribe_array(audio_data) if audio_data is not None else ""
     
     print("Transcription:")
     print(result)
@@ -10,12 +10,8 @@ This script demonstrates how to use the text-to-speech functionality.
 import os
 import argparse
 import logging
-import pygame
 from tts import speak_text, is_elevenlabs_available, TextToSpeech
 
-# Initialize pygame
-pygame.init()
-
 # Try to import utils, but don't fail if it doesn't exist
 try:
     from utils import get_config
@@ -9,16 +9,12 @@ This script allows you to test the text-to-speech functionality by entering text
 
 import os
 import logging
-import pygame
 from tts import speak_text, is_elevenlabs_available
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize pygame
-pygame.init()
-
 def main():
     print("\nText-to-Speech Test Script")
     print("===========================")
@@ -9,13 +9,122 @@ or pyttsx3 as a fallback option.
 """
 
 import os
+import shutil
+import hashlib
 import logging
-import tempfile
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import requests
-import pyttsx3
 import io
-import pygame
+
+# requests, pyttsx3 and pygame (which brings up SDL) are imported on first
+# use, so scripts that never speak don't pay for them; see _import_requests,
+# _import_pygame and _get_pyttsx_engine
+requests = None
+pygame = None
+
+# ElevenLabs model used for synthesis; part of the audio cache key
+ELEVENLABS_MODEL = "eleven_monolingual_v1"
+
+# Streamed ElevenLabs audio starts playing once this much has arrived
+# (about four seconds of 128 kbps MP3)
+PREBUFFER_BYTES = 64 * 1024
+STREAM_CHUNK_SIZE = 4096
+
+# Streaming buffers up to this size are kept for the next utterance;
+# larger ones are dropped so one long reply doesn't pin the memory
+AUDIO_BUFFER_MAX = 128 * 1024
+
+# How often playback is checked for having finished
+PLAYBACK_POLL_MS = 100
+
+# Headers shared by every ElevenLabs request
+ELEVENLABS_HEADERS = {
+    "Accept": "audio/mpeg",
+    "Content-Type": "application/json"
+}
+
+ELEVENLABS_TTS_URL = "https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"
+
+# Request body fields that don't depend on the text; each request makes a
+# shallow copy and adds "text"
+ELEVENLABS_BODY = {
+    "model_id": ELEVENLABS_MODEL,
+    "voice_settings": {
+        "stability": 0.5,
+        "similarity_boost": 0.5
+    }
+}
+
+
+def _import_requests():
+    """
+    Import requests the first time it is needed.
+    
+    Returns:
+        module: The requests module
+    """
+    global requests
+    
+    if requests is None:
+        import requests as requests_module
+        requests = requests_module
+    return requests
+
+
+def _import_pygame():
+    """
+    Import pygame the first time it is needed.
+    
+    Returns:
+        module: The pygame module
+    """
+    global pygame
+    
+    if pygame is None:
+        import pygame as pygame_module
+        pygame = pygame_module
+    return pygame
+
+
+def _new_session():
+    """
+    Create a pooled session for ElevenLabs requests.
+    
+    Returns:
+        requests.Session: Session that keeps its TLS connection alive between utterances.
+    """
+    _import_requests()
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    session.headers.update(ELEVENLABS_HEADERS)
+    return session
+
+
+# Session used by speak_text, created by its first ElevenLabs request
+_SESSION = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """
+    Get or create the session used by speak_text (singleton pattern).
+    
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _SESSION
+    
+    if _SESSION is None:
+        with _session_lock:
+            if _SESSION is None:
+                _SESSION = _new_session()
+    return _SESSION
+
 
 def is_elevenlabs_available():
     """
@@ -27,6 +136,148 @@ def is_elevenlabs_available():
     return bool(os.environ.get('ELEVENLABS_API_KEY'))
 
 
+def _configure_voice(engine):
+    """
+    Apply the default voice settings to a pyttsx3 engine.
+    
+    Args:
+        engine: An initialized pyttsx3 engine.
+    """
+    voices = engine.getProperty('voices')
+    # Set a female voice if available
+    for voice in voices:
+        if 'female' in voice.name.lower():
+            engine.setProperty('voice', voice.id)
+            break
+    engine.setProperty('rate', 175)  # Speed of speech
+
+
+def _init_mixer():
+    """
+    Initialize the pygame mixer if not already initialized.
+    
+    Only the mixer is started; pygame's other subsystems are left alone.
+    """
+    _import_pygame()
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+
+
+def _wait_for_playback():
+    """
+    Block until pygame music playback has finished.
+    
+    Playback runs on worker threads, where pygame's event queue can't be
+    used: it needs the video subsystem, which must stay on the main thread.
+    So the mixer is polled, sleeping in pygame.time.wait() between checks.
+    """
+    while pygame.mixer.music.get_busy():
+        pygame.time.wait(PLAYBACK_POLL_MS)
+
+
+def _play_mp3(audio_file):
+    """
+    Play an MP3 file and wait for it to finish.
+    
+    Args:
+        audio_file: Path of the MP3 file.
+    """
+    _init_mixer()
+    pygame.mixer.music.load(str(audio_file))
+    pygame.mixer.music.play()
+    _wait_for_playback()
+
+
+def _mp3_frame_start(audio, start):
+    """
+    Find the first MP3 frame header at or after an offset.
+    
+    Args:
+        audio (bytearray): MP3 data received so far.
+        start (int): Offset to search from.
+        
+    Returns:
+        int: Offset of the frame sync word, or -1 if none has arrived yet.
+    """
+    i = audio.find(b'\xff', start)
+    while i != -1 and i + 1 < len(audio):
+        if audio[i + 1] & 0xE0 == 0xE0:
+            return i
+        i = audio.find(b'\xff', i + 1)
+    return -1
+
+
+def _play_mp3_stream(response, audio=None):
+    """
+    Play a streamed MP3 HTTP response while the rest of it is still downloading.
+    
+    Playback starts once PREBUFFER_BYTES have arrived, cut at an MP3 frame
+    boundary, and the remainder is queued behind it when the download
+    completes.
+    
+    Args:
+        response: A requests response opened with stream=True.
+        audio (bytearray): Buffer to collect the MP3 data in; it is cleared
+            first. A new one is used if omitted.
+        
+    Returns:
+        bytearray: The complete MP3 data.
+    """
+    _init_mixer()
+    if audio is None:
+        audio = bytearray()
+    else:
+        audio.clear()
+    played = 0
+    
+    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+        audio += chunk
+        if not played:
+            split = _mp3_frame_start(audio, PREBUFFER_BYTES)
+            if split > 0:
+                with memoryview(audio) as view:
+                    head = bytes(view[:split])
+                pygame.mixer.music.load(io.BytesIO(head), 'mp3')
+                pygame.mixer.music.play()
+                played = split
+    
+    if played < len(audio):
+        with memoryview(audio) as view:
+            rest = io.BytesIO(bytes(view[played:]))
+        if played and pygame.mixer.music.get_busy():
+            pygame.mixer.music.queue(rest, 'mp3')
+        else:
+            pygame.mixer.music.load(rest, 'mp3')
+            pygame.mixer.music.play()
+    
+    _wait_for_playback()
+    return audio
+
+
+# Shared pyttsx3 engine, created and configured once; the lock serializes
+# use since a driver can only run one utterance loop at a time
+_PYTTSX_ENGINE = None
+_pyttsx_lock = threading.Lock()
+
+
+def _get_pyttsx_engine():
+    """
+    Get or initialize the shared pyttsx3 engine (singleton pattern).
+    
+    Call with _pyttsx_lock held.
+    
+    Returns:
+        The configured pyttsx3 engine.
+    """
+    global _PYTTSX_ENGINE
+    
+    if _PYTTSX_ENGINE is None:
+        import pyttsx3
+        _PYTTSX_ENGINE = pyttsx3.init()
+        _configure_voice(_PYTTSX_ENGINE)
+    return _PYTTSX_ENGINE
+
+
 def speak_text(text: str):
     """
     Convert text to speech using ElevenLabs if available, otherwise fallback to pyttsx3.
@@ -34,11 +285,13 @@ def speak_text(text: str):
     Args:
         text (str): The text to convert to speech.
     """
-    if not text:
+    # Whitespace or a lone character isn't worth a request or a playback
+    text = text.strip() if text else ""
+    if len(text) < 2:
         return
         
     logger = logging.getLogger(__name__)
-    logger.info(f"Converting to speech: {text[:50]}..." if len(text) > 50 else f"Converting to speech: {text}")
+    logger.info("Converting to speech: %s", text[:50] + "..." if len(text) > 50 else text)
     
     # Check if ElevenLabs is available
     if is_elevenlabs_available():
@@ -47,49 +300,20 @@ def speak_text(text: str):
             api_key = os.environ.get('ELEVENLABS_API_KEY')
             
             # ElevenLabs API endpoint
-            url = "https://api.elevenlabs.io/v1/text-to-speech/21m00Tcm4TlvDq8ikWAM"  # Default voice ID
+            url = ELEVENLABS_TTS_URL.format(voice_id=DEFAULT_VOICE_ID) + "/stream"
             
-            # Request headers
-            headers = {
-                "Accept": "audio/mpeg",
-                "Content-Type": "application/json",
-                "xi-api-key": api_key
-            }
+            # Request headers (Accept and Content-Type are set on the session)
+            headers = {"xi-api-key": api_key}
             
             # Request body
-            data = {
-                "text": text,
-                "model_id": "eleven_monolingual_v1",
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.5
-                }
-            }
+            data = {**ELEVENLABS_BODY, "text": text}
             
-            # Make the API call
-            response = requests.post(url, json=data, headers=headers)
-            
-            if response.status_code == 200:
-                # Save the audio to a temporary file
-                output_file = "output.mp3"
-                with open(output_file, "wb") as f:
-                    f.write(response.content)
-                
-                # Initialize pygame mixer if not already initialized
-                if not pygame.mixer.get_init():
-                    pygame.mixer.init()
-                
-                # Play the audio using pygame
-                pygame.mixer.music.load(output_file)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to finish
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
-                
-                logger.info("Speech played using ElevenLabs")
-                return
-            else:
+            # Make the API call, playing the audio as it streams in
+            with _get_session().post(url, json=data, headers=headers, stream=True) as response:
+                if response.status_code == 200:
+                    _play_mp3_stream(response)
+                    logger.info("Speech played using ElevenLabs")
+                    return
                 logger.error(f"ElevenLabs API error: {response.status_code} - {response.text}")
         except Exception as e:
             logger.error(f"Error using ElevenLabs: {str(e)}")
@@ -97,16 +321,10 @@ def speak_text(text: str):
     
     # Fallback to pyttsx3
     try:
-        engine = pyttsx3.init()
-        voices = engine.getProperty('voices')
-        # Set a female voice if available
-        for voice in voices:
-            if 'female' in voice.name.lower():
-                engine.setProperty('voice', voice.id)
-                break
-        engine.setProperty('rate', 175)  # Speed of speech
-        engine.say(text)
-        engine.runAndWait()
+        with _pyttsx_lock:
+            engine = _get_pyttsx_engine()
+            engine.say(text)
+            engine.runAndWait()
         logger.info("Speech played using pyttsx3")
     except Exception as e:
         logger.error(f"Error using pyttsx3: {str(e)}")
@@ -136,6 +354,24 @@ class TextToSpeech:
         # Create cache directory if it doesn't exist
         Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
         
+        # Single worker keeps synthesis ordered and pyttsx3 on one thread
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pyttsx = None
+        
+        # Reused for each streamed ElevenLabs clip; see AUDIO_BUFFER_MAX
+        self._audio_buf = bytearray()
+        
+        # Pooled session with the API key set once; the environment variable
+        # takes precedence over the config
+        self._session = _new_session()
+        api_key = os.environ.get('ELEVENLABS_API_KEY', self.elevenlabs_api_key)
+        if api_key:
+            self._session.headers["xi-api-key"] = api_key
+        
+        # Endpoints for the configured voice, built once
+        self._url = ELEVENLABS_TTS_URL.format(voice_id=self.elevenlabs_voice_id)
+        self._stream_url = self._url + "/stream"
+        
         if self.use_elevenlabs and self.elevenlabs_api_key:
             self.logger.info("Initializing ElevenLabs TTS")
             try:
@@ -155,9 +391,9 @@ class TextToSpeech:
         Initialize the pyttsx3 engine as a fallback.
         """
         try:
-            # Test if pyttsx3 can be initialized
-            engine = pyttsx3.init()
-            engine.stop()
+            # Initialize once and reuse the engine for every utterance
+            with _pyttsx_lock:
+                self._pyttsx = _get_pyttsx_engine()
             
             self.engine_type = 'pyttsx3'
             self.logger.info("pyttsx3 TTS initialized successfully")
@@ -172,77 +408,34 @@ class TextToSpeech:
         Args:
             text (str): The text to convert to speech.
         """
-        if not text:
+        text = text.strip() if text else ""
+        if len(text) < 2:
             return
         
-        self.logger.info(f"Converting to speech: {text[:50]}..." if len(text) > 50 else f"Converting to speech: {text}")
+        self.logger.info("Converting to speech: %s", text[:50] + "..." if len(text) > 50 else text)
         
         try:
             if self.engine_type == 'elevenlabs':
-                # Use the environment variable if available, otherwise use the config
-                api_key = os.environ.get('ELEVENLABS_API_KEY', self.elevenlabs_api_key)
-                
-                if api_key:
-                    # ElevenLabs API endpoint
-                    url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.elevenlabs_voice_id}"
-                    
-                    # Request headers
-                    headers = {
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": api_key
-                    }
-                    
-                    # Request body
-                    data = {
-                        "text": text,
-                        "model_id": "eleven_monolingual_v1",
-                        "voice_settings": {
-                            "stability": 0.5,
-                            "similarity_boost": 0.5
-                        }
-                    }
-                    
-                    # Make the API call
-                    response = requests.post(url, json=data, headers=headers)
-                    
-                    if response.status_code == 200:
-                        # Save the audio to a temporary file in the cache directory
-                        output_file = os.path.join(self.cache_dir, "output.mp3")
-                        with open(output_file, "wb") as f:
-                            f.write(response.content)
-                        
-                        # Initialize pygame mixer if not already initialized
-                        if not pygame.mixer.get_init():
-                            pygame.mixer.init()
-                        
-                        # Play the audio using pygame
-                        pygame.mixer.music.load(output_file)
-                        pygame.mixer.music.play()
-                        
-                        # Wait for playback to finish
-                        while pygame.mixer.music.get_busy():
-                            pygame.time.Clock().tick(10)
-                        
-                        self.logger.info("Speech played using ElevenLabs")
-                        return
-                    else:
-                        self.logger.error(f"ElevenLabs API error: {response.status_code} - {response.text}")
-                        raise Exception(f"ElevenLabs API error: {response.status_code}")
+                audio_file = self._cache_file(text)
+                if audio_file.exists():
+                    self.logger.info("Using cached ElevenLabs audio")
+                    _play_mp3(audio_file)
                 else:
-                    self.logger.error("ElevenLabs API key not found")
-                    raise Exception("ElevenLabs API key not found")
+                    # Play while downloading, then keep the clip for next time
+                    with self._elevenlabs_response(text, stream=True) as response:
+                        _play_mp3_stream(response, self._audio_buf)
+                    self._write_cache(audio_file, self._audio_buf)
+                    if len(self._audio_buf) > AUDIO_BUFFER_MAX:
+                        self._audio_buf = bytearray()
+                    else:
+                        self._audio_buf.clear()
+                
+                self.logger.info("Speech played using ElevenLabs")
+                return
             elif self.engine_type == 'pyttsx3':
-                engine = pyttsx3.init()
-                voices = engine.getProperty('voices')
-                # Set a female voice if available
-                for voice in voices:
-                    if 'female' in voice.name.lower():
-                        engine.setProperty('voice', voice.id)
-                        break
-                engine.setProperty('rate', 175)  # Speed of speech
-                engine.say(text)
-                engine.runAndWait()
+                with _pyttsx_lock:
+                    self._pyttsx.say(text)
+                    self._pyttsx.runAndWait()
                 self.logger.info("Speech played using pyttsx3")
             else:
                 self.logger.warning("No TTS engine available")
@@ -253,19 +446,189 @@ class TextToSpeech:
                 self._init_pyttsx3()
                 self.speak(text)  # Try again with pyttsx3
     
+    def speak_nowait(self, text):
+        """
+        Queue text to be spoken on the engine's worker thread and return immediately.
+        
+        Lets the caller prepare the next response while this one is fetched
+        and played. Utterances are spoken in the order they were queued.
+        
+        Args:
+            text (str): The text to convert to speech.
+            
+        Returns:
+            concurrent.futures.Future: Completes when playback has finished.
+        """
+        return self._executor.submit(self.speak, text)
+    
+    def synthesize(self, text, output_file=None):
+        """
+        Convert text to speech and save it to an audio file instead of playing it.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (str): Where to write the audio. Defaults to the
+                text's file in the cache directory, reused for repeated text.
+                
+        Returns:
+            str: Path to the audio file, or None if synthesis failed.
+        """
+        if not text:
+            return None
+        
+        try:
+            if self.engine_type == 'elevenlabs':
+                audio_file = self._elevenlabs_audio(text)
+                if output_file is None:
+                    return str(audio_file)
+                shutil.copyfile(audio_file, output_file)
+                return output_file
+            elif self.engine_type == 'pyttsx3':
+                audio_file = self._pyttsx_audio(text)
+                if output_file is None:
+                    return str(audio_file)
+                shutil.copyfile(audio_file, output_file)
+                return output_file
+            else:
+                self.logger.warning("No TTS engine available")
+                return None
+        except Exception as e:
+            self.logger.error(f"Error synthesizing speech: {str(e)}")
+            return None
+    
+    async def synthesize_async(self, text):
+        """
+        Run synthesize() on the engine's worker thread without blocking the event loop.
+        
+        Args:
+            text (str): The text to convert to speech.
+            
+        Returns:
+            str: Path to the audio file, or None if synthesis failed.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.synthesize, text)
+    
+    def _cache_key(self, text):
+        """
+        Content hash identifying the ElevenLabs audio for a text.
+        
+        Args:
+            text (str): The text to convert to speech.
+            
+        Returns:
+            str: Hex SHA-256 digest of voice, model and text.
+        """
+        return hashlib.sha256(f"{self.elevenlabs_voice_id}|{ELEVENLABS_MODEL}|{text}".encode('utf-8')).hexdigest()
+    
+    def _cache_file(self, text):
+        """
+        Path where the ElevenLabs audio for a text is cached.
+        
+        Args:
+            text (str): The text to convert to speech.
+            
+        Returns:
+            Path: MP3 file in the cache directory (which may not exist yet).
+        """
+        return Path(self.cache_dir) / f"{self._cache_key(text)}.mp3"
+    
+    def _write_cache(self, audio_file, audio):
+        """
+        Store ElevenLabs audio in the cache.
+        
+        Args:
+            audio_file (Path): Destination from _cache_file.
+            audio (bytes or bytearray): MP3 data.
+        """
+        # Write under a temporary name so a concurrent reader never sees a partial file
+        tmp_file = audio_file.with_suffix('.tmp')
+        tmp_file.write_bytes(audio)
+        os.replace(tmp_file, audio_file)
+    
+    def _elevenlabs_response(self, text, stream=False):
+        """
+        Request speech for a text from the ElevenLabs API.
+        
+        Args:
+            text (str): The text to convert to speech.
+            stream (bool): Use the streaming endpoint and don't read the body up front.
+            
+        Returns:
+            requests.Response: A successful response carrying MP3 audio.
+        """
+        if "xi-api-key" not in self._session.headers:
+            self.logger.error("ElevenLabs API key not found")
+            raise Exception("ElevenLabs API key not found")
+        
+        # ElevenLabs API endpoint
+        url = self._stream_url if stream else self._url
+        
+        # Make the API call
+        response = self._session.post(url, json={**ELEVENLABS_BODY, "text": text}, stream=stream)
+        if response.status_code != 200:
+            self.logger.error(f"ElevenLabs API error: {response.status_code} - {response.text}")
+            response.close()
+            raise Exception(f"ElevenLabs API error: {response.status_code}")
+        return response
+    
+    def _elevenlabs_audio(self, text):
+        """
+        Get the ElevenLabs MP3 for a text, calling the API only on a cache miss.
+        
+        Args:
+            text (str): The text to convert to speech.
+            
+        Returns:
+            Path: The cached MP3 file in the cache directory.
+        """
+        audio_file = self._cache_file(text)
+        if audio_file.exists():
+            self.logger.info("Using cached ElevenLabs audio")
+            return audio_file
+        
+        self._write_cache(audio_file, self._elevenlabs_response(text).content)
+        return audio_file
+    
+    def _pyttsx_audio(self, text):
+        """
+        Get the pyttsx3 WAV for a text, synthesizing it only on a cache miss.
+        
+        Clips are named by a hash of the text, so repeated sentences share
+        one file instead of each adding a new one to the cache directory.
+        
+        Args:
+            text (str): The text to convert to speech.
+            
+        Returns:
+            Path: The cached WAV file in the cache directory.
+        """
+        key = hashlib.sha256(f"pyttsx3|{text}".encode('utf-8')).hexdigest()
+        audio_file = Path(self.cache_dir) / f"{key}.wav"
+        if audio_file.exists():
+            self.logger.info("Using cached pyttsx3 audio")
+            return audio_file
+        
+        # Render under a temporary name so a concurrent reader never sees a
+        # partial file. The engine is serialized anyway, so the rename and a
+        # re-check sit under the same lock: a sentence repeated in one reply
+        # is rendered once instead of two renders sharing the temporary file
+        tmp_file = audio_file.with_suffix('.tmp')
+        with _pyttsx_lock:
+            if not audio_file.exists():
+                self._pyttsx.save_to_file(text, str(tmp_file))
+                self._pyttsx.runAndWait()
+                os.replace(tmp_file, audio_file)
+        return audio_file
+    
     def cleanup(self):
         """
         Clean up resources used by the TTS engine.
         """
         self.logger.info("Cleaning up TTS resources")
+        self._executor.shutdown(wait=True)
+        self._session.close()
         
-        # Remove temporary audio files if they exist
-        output_file = os.path.join(self.cache_dir, "output.mp3")
-        if os.path.exists(output_file):
-            try:
-                os.remove(output_file)
-                self.logger.info(f"Removed temporary audio file: {output_file}")
-            except Exception as e:
-                self.logger.error(f"Error removing temporary file: {str(e)}")
-        
-        # No need to clean up pyttsx3 as we create a new instance each time
\ No newline at end of file
+        if self._pyttsx is not None:
+            with _pyttsx_lock:
+                self._pyttsx.stop()
\ No newline at end of file
@@ -11,9 +11,13 @@ It can be used to change the API key without modifying the source code.
 import os
 import sys
 import json
-import argparse
 import logging
-from pathlib import Path
+
+# orjson parses and writes config files several times faster than json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -24,30 +28,91 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def update_environment_variable(api_key):
+def _loads(data):
     """
-    Update the OPENAI_API_KEY environment variable.
+    Parse JSON bytes.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj):
+    """
+    Serialize an object to indented JSON bytes.
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _write_config(config_path, config):
+    """
+    Write a configuration file atomically.
+    
+    The config is encoded up front, written to a temporary file with a
+    single write and synced, then renamed over the target, so a crash never
+    leaves a half-written file. The file is readable by its owner only,
+    since it holds the API key.
     
     Args:
-        api_key: The OpenAI API key
+        config_path: Path to the configuration file
+        config: Configuration to write
+    """
+    data = memoryview(_dumps(config))
+    tmp_path = f"{config_path}.tmp"
+    
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, config_path)
+
+
+# Win32 constants for announcing environment changes to running programs
+HWND_BROADCAST = 0xFFFF
+WM_SETTINGCHANGE = 0x001A
+SMTO_ABORTIFHUNG = 0x0002
+
+
+def update_environment_variables(variables):
+    """
+    Set several environment variables at once.
+    
+    On Windows they are also written to the user's registry environment
+    under one key handle, and running programs are told about the change
+    with a single WM_SETTINGCHANGE broadcast.
+    
+    Args:
+        variables: Mapping of variable name to value
         
     Returns:
         bool: True if successful, False otherwise
     """
+    names = ", ".join(variables)
     try:
-        # Set environment variable for current process
-        os.environ["OPENAI_API_KEY"] = api_key
-        logger.info("Updated OPENAI_API_KEY environment variable for current process")
+        # Set environment variables for current process
+        os.environ.update(variables)
+        logger.info(f"Updated environment for current process: {names}")
         
-        # For Windows, also set it at the system level (requires admin privileges)
+        # For Windows, also set them at the user level
         if os.name == 'nt':
             try:
+                import ctypes
                 import winreg
-                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment", 0, winreg.KEY_ALL_ACCESS)
-                winreg.SetValueEx(key, "OPENAI_API_KEY", 0, winreg.REG_SZ, api_key)
-                winreg.CloseKey(key)
-                logger.info("Updated OPENAI_API_KEY in Windows registry (user level)")
-                print("NOTE: You may need to log out and log back in for the environment variable to take effect system-wide.")
+                with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment", 0, winreg.KEY_ALL_ACCESS) as key:
+                    for name, value in variables.items():
+                        winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)
+                logger.info(f"Updated Windows registry (user level): {names}")
+                
+                ctypes.windll.user32.SendMessageTimeoutW(
+                    HWND_BROADCAST, WM_SETTINGCHANGE, 0, "Environment",
+                    SMTO_ABORTIFHUNG, 100, None
+                )
+                print("NOTE: Terminals that are already open keep the old value; open a new one to use the update.")
             except Exception as e:
                 logger.warning(f"Could not update Windows registry: {str(e)}")
                 logger.warning("The environment variable will only be available for the current process.")
@@ -58,6 +123,19 @@ def update_environment_variable(api_key):
         return False
 
 
+def update_environment_variable(api_key):
+    """
+    Update the OPENAI_API_KEY environment variable.
+    
+    Args:
+        api_key: The OpenAI API key
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return update_environment_variables({"OPENAI_API_KEY": api_key})
+
+
 def update_config_file(api_key, config_path):
     """
     Update the API key in a configuration file.
@@ -70,15 +148,14 @@ def update_config_file(api_key, config_path):
         bool: True if successful, False otherwise
     """
     try:
-        # Check if file exists
-        if not os.path.exists(config_path):
+        # Load existing config; opening it doubles as the existence check
+        try:
+            with open(config_path, 'rb') as f:
+                config = _loads(f.read())
+        except FileNotFoundError:
             logger.warning(f"Configuration file {config_path} not found")
             return False
         
-        # Load existing config
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        
         # Update API key
         if "openai" not in config:
             config["openai"] = {}
@@ -86,8 +163,7 @@ def update_config_file(api_key, config_path):
         config["openai"]["api_key"] = api_key
         
         # Write updated config
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        _write_config(config_path, config)
         
         logger.info(f"Updated API key in configuration file {config_path}")
         return True
@@ -135,8 +211,7 @@ def create_config_file(api_key, config_path):
         os.makedirs(os.path.dirname(os.path.abspath(config_path)), exist_ok=True)
         
         # Write config
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        _write_config(config_path, config)
         
         logger.info(f"Created new configuration file {config_path} with API key")
         return True
@@ -149,6 +224,9 @@ def main():
     """
     Main function to update the OpenAI API key.
     """
+    # Only needed here, so a bare invocation that just prints usage skips it
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Update OpenAI API Key")
     parser.add_argument("api_key", help="OpenAI API Key")
     parser.add_argument("--config", "-c", default="config.json", help="Path to configuration file")
@@ -175,14 +253,16 @@ def main():
     else:
         logger.warning(f"Configuration file {args.config} not found. Use --create to create it.")
     
-    # Print summary
-    print("\n===== Update Summary =====\n")
-    print(f"Environment Variable: {'✓ Updated' if env_success else '✗ Failed'}")
-    print(f"Configuration File: {'✓ Updated' if config_success else '✗ Not Updated'}")
-    print("\nTo use the new API key in your scripts:")
-    print("1. For new terminal sessions: The environment variable will be available")
-    print("2. For current terminal session: The environment variable is already set")
-    print("3. For configuration-based applications: The config file has been updated")
+    # Print summary in one write
+    sys.stdout.write(
+        "\n===== Update Summary =====\n\n"
+        f"Environment Variable: {'✓ Updated' if env_success else '✗ Failed'}\n"
+        f"Configuration File: {'✓ Updated' if config_success else '✗ Not Updated'}\n"
+        "\nTo use the new API key in your scripts:\n"
+        "1. For new terminal sessions: The environment variable will be available\n"
+        "2. For current terminal session: The environment variable is already set\n"
+        "3. For configuration-based applications: The config file has been updated\n"
+    )
     
     return 0 if env_success or config_success else 1
 
@@ -9,16 +9,80 @@ including logging setup, configuration management, and other utilities.
 """
 
 import os
+import re
 import json
+import queue
+import atexit
 import logging
-from pathlib import Path
+import logging.handlers
+import threading
 import sys
 from datetime import datetime
 
+# orjson parses and writes config files several times faster than json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# End of a sentence: terminal punctuation followed by whitespace
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Characters not allowed in file names, each mapped to an underscore
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+SANITIZE_MAX_LENGTH = 100
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Directories create_directories has already made in this process
+_created_dirs = set()
+
+# Listener started by the last setup_logging call
+_log_listener = None
+
+# Parsed configuration per absolute path, with the (mtime, size, inode) of
+# the file it was read from; an edited or replaced file is read again
+_config_cache = {}
+_config_lock = threading.Lock()
+
+def _loads(data):
+    """
+    Parse JSON bytes.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj):
+    """
+    Serialize an object to indented JSON bytes.
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+def _stop_log_listener():
+    """
+    Stop the logging listener, writing out queued records, and close its handlers.
+    """
+    global _log_listener
+    
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+atexit.register(_stop_log_listener)
+
 def setup_logging(log_level=logging.INFO, log_file=None):
     """
     Set up logging configuration for the application.
     
+    Log calls only put the record on a queue; a listener thread does the
+    console and file writes. Calling this again replaces the previous
+    setup rather than adding a second set of handlers, and it takes over
+    from any logging.basicConfig a module ran at import time.
+    
     Args:
         log_level: The logging level (default: INFO)
         log_file: Path to log file (default: None, logs to console only)
@@ -26,25 +90,43 @@ def setup_logging(log_level=logging.INFO, log_file=None):
     Returns:
         logger: Configured logger instance
     """
+    global _log_listener
+    
     # Create logs directory if logging to file
     if log_file:
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
     
     # Configure logging format
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
-    # Configure handlers
+    # Configure handlers; the log file isn't opened until the first record
+    formatter = logging.Formatter(log_format)
     handlers = [logging.StreamHandler(sys.stdout)]
     if log_file:
-        handlers.append(logging.FileHandler(log_file))
+        handlers.append(logging.FileHandler(log_file, delay=True))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Hand the real handlers to a background listener, replacing the one
+    # from any earlier call; stopping it at exit writes out what is queued
+    _stop_log_listener()
+    log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    
+    # The queue handler only renders the message; the listener's handlers
+    # apply the full format
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
     
-    # Apply configuration
+    # Apply configuration; force replaces the root handlers instead of
+    # silently doing nothing when some import already configured logging
     logging.basicConfig(
         level=log_level,
-        format=log_format,
-        handlers=handlers
+        handlers=[queue_handler],
+        force=True
     )
     
     logger = logging.getLogger('voice_assistant')
@@ -52,97 +134,121 @@ def setup_logging(log_level=logging.INFO, log_file=None):
     
     return logger
 
+# Default configuration; get_config fills in any key a config file lacks
+DEFAULT_CONFIG = {
+    # General settings
+    'assistant_name': 'Voice Assistant',
+    'language': 'en',
+    'log_level': 'INFO',
+    'log_file': 'logs/assistant.log',
+    
+    # API keys (to be filled by user)
+    'openai_api_key': '',
+    'elevenlabs_api_key': '',
+    
+    # STT settings
+    'whisper_model': 'base',  # tiny, base, small, medium, large
+    'sample_rate': 16000,
+    'record_duration': 5,  # seconds
+    
+    # TTS settings
+    'use_elevenlabs': True,
+    'elevenlabs_voice_id': 'Rachel',  # Default voice
+    'tts_cache_dir': 'tts_cache',
+    
+    # LLM settings
+    'openai_model': 'gpt-4o',
+    'temperature': 0.7,
+    'max_tokens': 150,
+    
+    # Knowledge base settings
+    'knowledge_dir': 'knowledge',
+    'index_path': 'faiss_index',
+    'chunk_size': 1000,
+    'chunk_overlap': 200,
+    'nprobe': 8,  # IVF cells scanned per query
+    'index_factory': 'IVF{nlist},SQfp16',
+    'embedding_model': 'text-embedding-3-small',
+    
+    # UI settings
+    'ui_type': 'gradio',  # 'flask' or 'gradio'
+    'port': 7860,
+    'host': '127.0.0.1',
+    'debug': False
+}
+
 def get_config(config_path='config.json'):
     """
     Load configuration from a JSON file, or create default if not exists.
     
+    The file is only parsed again once it changes on disk.
+    
     Args:
         config_path: Path to the configuration file
         
     Returns:
-        dict: Configuration parameters
-    """
-    # Default configuration
-    default_config = {
-        # General settings
-        'assistant_name': 'Voice Assistant',
-        'language': 'en',
-        'log_level': 'INFO',
-        'log_file': 'logs/assistant.log',
-        
-        # API keys (to be filled by user)
-        'openai_api_key': '',
-        'elevenlabs_api_key': '',
-        
-        # STT settings
-        'whisper_model': 'base',  # tiny, base, small, medium, large
-        'sample_rate': 16000,
-        'record_duration': 5,  # seconds
-        
-        # TTS settings
-        'use_elevenlabs': True,
-        'elevenlabs_voice_id': 'Rachel',  # Default voice
-        'tts_cache_dir': 'tts_cache',
-        
-        # LLM settings
-        'openai_model': 'gpt-4o',
-        'temperature': 0.7,
-        'max_tokens': 150,
-        
-        # Knowledge base settings
-        'knowledge_dir': 'knowledge',
-        'index_path': 'faiss_index',
-        'chunk_size': 1000,
-        'chunk_overlap': 200,
-        
-        # UI settings
-        'ui_type': 'gradio',  # 'flask' or 'gradio'
-        'port': 7860,
-        'host': '127.0.0.1',
-        'debug': False
-    }
-    
+        dict: Configuration parameters (a copy the caller may modify)
+    """
     # Create config file with defaults if it doesn't exist
-    if not os.path.exists(config_path):
-        with open(config_path, 'w') as f:
-            json.dump(default_config, f, indent=4)
+    path = os.path.abspath(config_path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        with open(config_path, 'wb') as f:
+            f.write(_dumps(DEFAULT_CONFIG))
         logging.info(f"Created default configuration at {config_path}")
-        return default_config
+        return dict(DEFAULT_CONFIG)
+    
+    # Serve an unchanged file from the cache
+    version = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _config_cache.get(path)
+    if cached and cached[0] == version:
+        return dict(cached[1])
     
     # Load existing configuration
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        with open(config_path, 'rb') as f:
+            config = _loads(f.read())
         logging.info(f"Loaded configuration from {config_path}")
         
         # Update with any missing default values
-        for key, value in default_config.items():
-            if key not in config:
-                config[key] = value
+        config = DEFAULT_CONFIG | config
         
-        return config
+        with _config_lock:
+            _config_cache[path] = (version, config)
+        return dict(config)
     except Exception as e:
         logging.error(f"Error loading configuration: {str(e)}")
         logging.info("Using default configuration")
-        return default_config
+        return dict(DEFAULT_CONFIG)
+
+def clear_config_cache():
+    """
+    Forget all cached configuration, so the next get_config reads the file.
+    """
+    with _config_lock:
+        _config_cache.clear()
 
 def create_directories(config):
     """
     Create necessary directories for the application.
     
+    Each directory is created once per process; later calls skip it.
+    
     Args:
         config: Application configuration
     """
-    directories = [
+    directories = {
         'logs',
         config.get('knowledge_dir', 'knowledge'),
         config.get('tts_cache_dir', 'tts_cache'),
         os.path.dirname(config.get('log_file', 'logs/assistant.log'))
-    ]
+    }
     
-    for directory in directories:
+    for directory in directories - _created_dirs:
         if directory:
-            Path(directory).mkdir(parents=True, exist_ok=True)
+            os.makedirs(directory, exist_ok=True)
+            _created_dirs.add(directory)
             logging.info(f"Created directory: {directory}")
 
 def format_time(seconds):
@@ -165,26 +271,37 @@ def format_time(seconds):
     else:
         return f"{seconds}s"
 
-def sanitize_filename(text):
+def sanitize_filename(text, timestamp=None):
     """
     Convert text to a safe filename.
     
     Args:
         text: Input text
+        timestamp: Suffix for uniqueness, already formatted with
+            TIMESTAMP_FORMAT; defaults to the current time. Callers naming
+            many files at once can format it once and pass it in.
         
     Returns:
         str: Safe filename
     """
-    # Replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        text = text.replace(char, '_')
-    
-    # Limit length
-    max_length = 100
-    if len(text) > max_length:
-        text = text[:max_length]
+    # Replace invalid characters in one pass and limit length
+    text = text.translate(_SANITIZE_TABLE)[:SANITIZE_MAX_LENGTH]
     
     # Add timestamp for uniqueness
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"{text}_{timestamp}"
\ No newline at end of file
+    if timestamp is None:
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    return f"{text}_{timestamp}"
+
+def split_sentences(text):
+    """
+    Split complete sentences off the front of a streaming text buffer.
+    
+    Args:
+        text: Text accumulated so far
+        
+    Returns:
+        tuple: (list of complete sentences, remaining partial text)
+    """
+    parts = _SENTENCE_END.split(text)
+    remainder = parts.pop()
+    return [part for part in parts if part.strip()], remainder
@@ -12,7 +12,13 @@ import os
 import sys
 import json
 import logging
-from pathlib import Path
+import functools
+
+# orjson parses and writes config files several times faster than json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +29,48 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _loads(data):
+    """
+    Parse JSON bytes.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _mask(api_key):
+    """
+    Mask an API key for display, keeping only its prefix and last four characters.
+    
+    Args:
+        api_key: The API key
+        
+    Returns:
+        str: Masked key
+    """
+    return f"{api_key[:7]}...{api_key[-4:]}" if len(api_key) > 11 else "***masked***"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config(config_path, mtime_ns, size):
+    """
+    Parse a configuration file, once per version of it.
+    
+    The modification time and size are part of the cache key, so a changed
+    file is parsed again. The returned dict is shared; don't modify it.
+    
+    Args:
+        config_path: Path to the configuration file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+        
+    Returns:
+        dict: Parsed configuration
+    """
+    with open(config_path, 'rb') as f:
+        return _loads(f.read())
+
+
 def check_environment_variable():
     """
     Check if the OPENAI_API_KEY environment variable is set.
@@ -33,8 +81,7 @@ def check_environment_variable():
     api_key = os.environ.get("OPENAI_API_KEY")
     if api_key:
         # Mask the API key for security
-        masked_key = f"{api_key[:7]}...{api_key[-4:]}" if len(api_key) > 11 else "***masked***"
-        return True, masked_key
+        return True, _mask(api_key)
     return False, None
 
 
@@ -49,67 +96,93 @@ def check_config_file(config_path):
         tuple: (bool, str) - (is_set, api_key_masked)
     """
     try:
-        if not os.path.exists(config_path):
+        try:
+            stat = os.stat(config_path)
+        except FileNotFoundError:
             logger.warning(f"Configuration file {config_path} not found")
             return False, None
         
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        config = _load_config(os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
         
         api_key = config.get("openai", {}).get("api_key")
         if api_key:
             # Mask the API key for security
-            masked_key = f"{api_key[:7]}...{api_key[-4:]}" if len(api_key) > 11 else "***masked***"
-            return True, masked_key
+            return True, _mask(api_key)
         return False, None
     except Exception as e:
         logger.error(f"Error checking configuration file: {str(e)}")
         return False, None
 
 
+def check_config_files(config_paths):
+    """
+    Check several configuration files, reading each distinct file at most once.
+    
+    Args:
+        config_paths: Paths to the configuration files
+        
+    Returns:
+        dict: (is_set, api_key_masked) per path, as from check_config_file
+    """
+    by_file = {}
+    results = {}
+    for config_path in config_paths:
+        real_path = os.path.realpath(config_path)
+        if real_path not in by_file:
+            by_file[real_path] = check_config_file(config_path)
+        results[config_path] = by_file[real_path]
+    return results
+
+
 def main():
     """
     Main function to verify the OpenAI API key.
+    
+    The report is collected and printed with a single write.
     """
-    print("\n===== OpenAI API Key Verification =====\n")
+    lines = ["", "===== OpenAI API Key Verification =====", ""]
     
     # Check environment variable
     env_set, env_key = check_environment_variable()
-    print(f"Environment Variable (OPENAI_API_KEY):")
+    lines.append(f"Environment Variable (OPENAI_API_KEY):")
     if env_set:
-        print(f"  ✓ Set: {env_key}")
+        lines.append(f"  ✓ Set: {env_key}")
     else:
-        print(f"  ✗ Not set")
+        lines.append(f"  ✗ Not set")
     
-    # Check default config file
+    # Check both config files in one pass
     default_config = "config.json"
-    config_set, config_key = check_config_file(default_config)
-    print(f"\nDefault Configuration File ({default_config}):")
+    example_config = "config_example.json"
+    config_results = check_config_files([default_config, example_config])
+    
+    # Default config file
+    config_set, config_key = config_results[default_config]
+    lines.append(f"\nDefault Configuration File ({default_config}):")
     if config_set:
-        print(f"  ✓ Set: {config_key}")
+        lines.append(f"  ✓ Set: {config_key}")
     else:
-        print(f"  ✗ Not set or file not found")
+        lines.append(f"  ✗ Not set or file not found")
     
-    # Check example config file
-    example_config = "config_example.json"
-    example_set, example_key = check_config_file(example_config)
-    print(f"\nExample Configuration File ({example_config}):")
+    # Example config file
+    example_set, example_key = config_results[example_config]
+    lines.append(f"\nExample Configuration File ({example_config}):")
     if example_set:
-        print(f"  ✓ Set: {example_key}")
+        lines.append(f"  ✓ Set: {example_key}")
     else:
-        print(f"  ✗ Not set or file not found")
+        lines.append(f"  ✗ Not set or file not found")
     
     # Summary
-    print("\n===== Summary =====\n")
+    lines.append("\n===== Summary =====\n")
     if env_set or config_set or example_set:
-        print("✓ OpenAI API key is available from at least one source")
-        print("  The chat module should be able to use the API key")
+        lines.append("✓ OpenAI API key is available from at least one source")
+        lines.append("  The chat module should be able to use the API key")
     else:
-        print("✗ OpenAI API key is not available from any source")
-        print("  The chat module will not be able to make API calls")
-        print("  Please set the API key using update_api_key.py")
+        lines.append("✗ OpenAI API key is not available from any source")
+        lines.append("  The chat module will not be able to make API calls")
+        lines.append("  Please set the API key using update_api_key.py")
     
-    print("\n" + "=" * 40 + "\n")
+    lines.append("\n" + "=" * 40 + "\n")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return 0 if env_set or config_set or example_set else 1
 